@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import json
 import re
+from functools import lru_cache
+from typing import Callable, Sequence
 
 from models.exam_document import (
     ContentBlock,
@@ -13,8 +16,59 @@ from models.exam_document import (
     ExamDocument,
 )
 
-# 텍스트 내 인라인 LaTeX $...$ 감지 패턴
-_INLINE_LATEX_RE = re.compile(r"(?<!\$)\$(?!\$)(.+?)(?<!\$)\$(?!\$)")
+# 블록 type 문자열 → ContentType 변환표 (매 호출마다 dict를 만들지 않도록 상수화)
+_TYPE_MAP: dict[str, ContentType] = {
+    "text": ContentType.TEXT,
+    "equation": ContentType.EQUATION,
+    "equation_block": ContentType.EQUATION_BLOCK,
+    "image": ContentType.IMAGE,
+    "table": ContentType.TABLE,
+}
+
+# 빈 결과용 불변 싱글턴: 핫 패스의 .get(key, []) 기본값과 빈 반환값에
+# 공유하여 호출마다 빈 리스트를 만들지 않습니다.
+_EMPTY: tuple = ()
+
+# 분리 패턴을 발동시킬 수 있는 문자 집합. 밑줄(__)·LaTeX($, \)·수식 후보
+# (영숫자로 시작)가 모두 이 집합의 문자를 요구하므로, 하나도 없으면
+# 정규식 분리를 통째로 건너뛸 수 있습니다.
+_MARKUP_TRANS = str.maketrans(
+    "", "",
+    "_$\\"
+    "abcdefghijklmnopqrstuvwxyz"
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    "0123456789",
+)
+
+# ── 통합 텍스트 분리 패턴 ──
+# 밑줄 마크업(__...__), 인라인 LaTeX($...$), 수식 후보를 한 번의 스캔으로
+# 감지합니다. 각 대안은 이름 있는 그룹 하나만 가지므로 match.lastgroup으로
+# 어떤 종류가 매치됐는지 판별할 수 있습니다.
+_UNDER_PART = r"(?P<under>__(?:.+?)__)"
+_LATEX_PART = r"(?P<latex>(?<!\$)\$(?!\$)(?:.+?)(?<!\$)\$(?!\$))"
+# 수식 후보: 영문 변수/숫자 + 수학 연산자(=, >, <, +, -, ×, ÷, ≤, ≥, ≠) 조합
+# 예: "a > 0", "b", "x = 3", "2x + 1"
+_MATH_PART = (
+    r"(?P<math>"
+    r"(?<![a-zA-Z])"          # 앞에 영문자 없음 (단어 중간 방지)
+    r"[a-zA-Z0-9]+"           # 시작: 변수/숫자
+    r"(?:"
+    r"\s*[=><+\-×÷≤≥≠^_]\s*"  # 수학 연산자
+    r"[a-zA-Z0-9]+"           # 뒤따르는 변수/숫자
+    r")*"
+    r"(?![a-zA-Z])"           # 뒤에 영문자 없음
+    r")"
+)
+_COMBINED_RE = re.compile(_UNDER_PART + "|" + _LATEX_PART)
+_COMBINED_MATH_RE = re.compile(
+    _UNDER_PART + "|" + _LATEX_PART + "|" + _MATH_PART
+)
+
+# 한글/영숫자 존재 여부 검사 (핫 패스에서 반복 호출되므로 모듈 레벨에 컴파일)
+_HAS_HANGUL = re.compile(r'[\uac00-\ud7a3]').search
+_HAS_ALNUM = re.compile(r'[a-zA-Z0-9]').search
+# LaTeX 수식 영역 종료 감지: 공백 뒤 한글이 나오면 수식 끝
+_LATEX_END_HANGUL = re.compile(r'(?<=[^\\])\s+[\uac00-\ud7a3]').search
 
 
 def parse_ocr_response(ocr_result: dict, page_number: int) -> ExamPage:
@@ -30,47 +84,125 @@ def parse_ocr_response(ocr_result: dict, page_number: int) -> ExamPage:
     page = ExamPage(page_number=page_number)
     page.header_text = ocr_result.get("header", "")
 
-    for q_data in ocr_result.get("questions", []):
-        question = _parse_question(q_data)
-        page.questions.append(question)
+    # 문제 수만큼 미리 할당 (하위 리스트들도 각자 원본 길이로 선할당됨)
+    src_questions = ocr_result.get("questions", _EMPTY)
+    page.questions = [None] * len(src_questions)  # type: ignore[list-item]
+    for i, q_data in enumerate(src_questions):
+        page.questions[i] = _parse_question(q_data)
 
     return page
 
 
+def parse_ocr_response_bytes(buf: bytes | str, page_number: int) -> ExamPage:
+    """OCR 응답 바이트(또는 문자열)를 곧바로 ExamPage로 변환.
+
+    중간 단계에서 별도 str 변환 없이 json.loads가 bytes를 직접
+    디코딩하므로, 응답 수신 → 구조화까지 한 번에 처리됩니다.
+
+    Args:
+        buf: OCR 응답 JSON 바이트/문자열
+        page_number: 페이지 번호 (1부터)
+
+    Returns:
+        ExamPage 객체
+    """
+    return parse_ocr_response(json.loads(buf), page_number)
+
+
+def _parse_one(numbered: tuple[int, dict]) -> ExamPage:
+    """(페이지 번호, OCR 결과) 쌍 하나를 변환 (워커 프로세스용)."""
+    page_number, ocr_result = numbered
+    return parse_ocr_response(ocr_result, page_number)
+
+
+def parse_pages(ocr_results: list[dict]) -> list[ExamPage]:
+    """여러 페이지의 OCR 결과를 일괄 변환.
+
+    페이지 간 의존성이 없으므로 4페이지 이상이면 프로세스 풀로
+    병렬 변환합니다 (순수 파이썬 작업이라 스레드로는 GIL 때문에
+    이득이 없음). 적은 분량은 풀 기동 비용이 더 크므로 순차 처리.
+
+    Args:
+        ocr_results: 페이지 순서대로 정렬된 OCR 응답 dict 리스트
+
+    Returns:
+        ExamPage 리스트 (입력과 같은 순서)
+    """
+    numbered = list(enumerate(ocr_results, 1))
+    if len(numbered) < 4:
+        return [_parse_one(item) for item in numbered]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(_parse_one, numbered, chunksize=2))
+
+
 def _parse_question(q_data: dict) -> Question:
-    """문제 dict를 Question 객체로 변환."""
-    question = Question(
+    """문제 dict를 Question 객체로 변환.
+
+    소문항(sub_questions)은 재귀 호출 대신 명시적 스택으로 순회하여
+    깊은 중첩에서도 호출 프레임 비용과 재귀 한도 문제가 없습니다.
+    """
+    root = Question(
         number=q_data.get("number", 0),
         score=q_data.get("score"),
     )
+    stack = [(q_data, root)]
+
+    while stack:
+        d, question = stack.pop()
+
+        # 문제 본문 (블록 수만큼 미리 할당하여 리스트 재확장 방지)
+        question.contents = _parse_content_blocks(d.get("contents", _EMPTY))
+
+        # 쉼표로 구분된 독립 수식 분리 (안전 폴백)
+        question.contents = _split_comma_equations(question.contents)
+
+        # 본문에서 배점 텍스트 제거 (score 필드에 이미 있으므로 중복 방지)
+        if question.score:
+            question.contents = _strip_score_text(question.contents)
+
+        # 선택지
+        src_choices = d.get("choices", _EMPTY)
+        choices: list[Choice] = [None] * len(src_choices)  # type: ignore[list-item]
+        i = 0
+        for choice_data in src_choices:
+            choice = _parse_choice(choice_data)
+            if choice:
+                choices[i] = choice
+                i += 1
+        del choices[i:]
+        question.choices = choices
+
+        # 소문항: 객체만 만들어 붙이고 본문 채우기는 스택으로 미룸
+        src_subs = d.get("sub_questions", _EMPTY)
+        question.sub_questions = [None] * len(src_subs)  # type: ignore[list-item]
+        for i, sub_data in enumerate(src_subs):
+            sub = Question(
+                number=sub_data.get("number", 0),
+                score=sub_data.get("score"),
+            )
+            question.sub_questions[i] = sub
+            stack.append((sub_data, sub))
 
-    # 문제 본문
-    for block_data in q_data.get("contents", []):
-        result = _parse_content_block(block_data)
-        if isinstance(result, list):
-            question.contents.extend(result)
-        elif result:
-            question.contents.append(result)
-
-    # 쉼표로 구분된 독립 수식 분리 (안전 폴백)
-    question.contents = _split_comma_equations(question.contents)
-
-    # 본문에서 배점 텍스트 제거 (score 필드에 이미 있으므로 중복 방지)
-    if question.score:
-        question.contents = _strip_score_text(question.contents)
+    return root
 
-    # 선택지
-    for choice_data in q_data.get("choices", []):
-        choice = _parse_choice(choice_data)
-        if choice:
-            question.choices.append(choice)
 
-    # 소문항
-    for sub_data in q_data.get("sub_questions", []):
-        sub = _parse_question(sub_data)
-        question.sub_questions.append(sub)
+def _parse_content_blocks(src: list[dict]) -> list[ContentBlock]:
+    """콘텐츠 블록 dict 리스트를 ContentBlock 리스트로 변환.
 
-    return question
+    블록 하나가 보통 블록 하나를 만들므로 결과 리스트를 입력 길이만큼
+    미리 할당하고, 분리로 여러 블록이 나온 경우에만 슬라이스 삽입합니다.
+    """
+    out: list[ContentBlock] = [None] * len(src)  # type: ignore[list-item]
+    i = 0
+    for block_data in src:
+        result = _parse_content_block(block_data)
+        out[i:i + 1] = result
+        i += len(result)
+    del out[i:]
+    return out
 
 
 def _parse_choice(choice_data: dict) -> Choice | None:
@@ -80,12 +212,7 @@ def _parse_choice(choice_data: dict) -> Choice | None:
         return None
 
     choice = Choice(number=number)
-    for block_data in choice_data.get("contents", []):
-        result = _parse_content_block(block_data)
-        if isinstance(result, list):
-            choice.contents.extend(result)
-        elif result:
-            choice.contents.append(result)
+    choice.contents = _parse_content_blocks(choice_data.get("contents", _EMPTY))
 
     # 쉼표로 구분된 독립 수식 분리
     choice.contents = _split_comma_equations(choice.contents)
@@ -93,61 +220,83 @@ def _parse_choice(choice_data: dict) -> Choice | None:
     return choice
 
 
-def _parse_content_block(block_data: dict) -> ContentBlock | None:
-    """콘텐츠 블록 dict를 ContentBlock 객체로 변환.
+# 인터닝 대상이 되는 최대 값 길이 (짧은 변수·구분자·숫자만)
+_INTERN_MAX_LEN = 32
+
 
-    텍스트 블록 안에 $...$ 인라인 LaTeX가 포함된 경우
-    텍스트+수식으로 분리하여 리스트로 반환하므로,
-    호출부에서 리스트 여부를 확인해야 합니다.
+@lru_cache(maxsize=2048)
+def _mk_block(t: ContentType, v: str, u: bool = False) -> ContentBlock:
+    """짧은 (타입, 값) 조합의 블록을 인터닝하는 팩토리.
+
+    "x", ", ", "0" 같은 짧은 값은 시험지 전체에서 수없이 반복되므로
+    같은 블록 인스턴스를 공유합니다. 파이프라인 어디에서도 블록 필드를
+    변이하지 않으므로 (hwp_equation 포함) 공유가 안전합니다.
     """
-    type_str = block_data.get("type", "")
-    value = block_data.get("value", "")
+    return ContentBlock(type=t, value=v, underline=u)
 
-    if not value and type_str != "image":
-        return None
 
-    type_map = {
-        "text": ContentType.TEXT,
-        "equation": ContentType.EQUATION,
-        "equation_block": ContentType.EQUATION_BLOCK,
-        "image": ContentType.IMAGE,
-        "table": ContentType.TABLE,
-    }
-
-    content_type = type_map.get(type_str)
-    if content_type is None:
-        content_type = ContentType.TEXT
-
-    # 표(table) 블록 처리
-    if content_type == ContentType.TABLE:
-        rows = block_data.get("rows", [])
-        return ContentBlock(type=ContentType.TABLE, value=value, rows=rows)
-
-    # 텍스트 블록에 __밑줄__ 마크업이 있으면 분리
-    if content_type == ContentType.TEXT and "__" in value:
-        split = _split_underline_markup(value)
-        if len(split) > 1:
-            return split  # type: ignore[return-value]
+def _make_block(t: ContentType, v: str, u: bool = False) -> ContentBlock:
+    """값 길이에 따라 인터닝 팩토리 또는 새 인스턴스를 선택."""
+    if len(v) <= _INTERN_MAX_LEN:
+        return _mk_block(t, v, u)
+    return ContentBlock(type=t, value=v, underline=u)
+
+
+def _handle_table_block(block_data: dict, value: str) -> Sequence[ContentBlock]:
+    """표(table) 블록 처리."""
+    rows = block_data.get("rows", [])
+    return (ContentBlock(type=ContentType.TABLE, value=value, rows=rows),)
 
-    # 텍스트 블록에 $...$ 인라인 LaTeX가 있으면 분리
-    if content_type == ContentType.TEXT and "$" in value:
-        split = _split_inline_latex(value)
-        if len(split) > 1:
-            return split  # type: ignore[return-value]
 
-    # 텍스트 블록에 LaTeX 명령어(\sqrt, \frac 등)가 있으면 수식 분리
-    if content_type == ContentType.TEXT and '\\' in value:
+def _handle_text_block(block_data: dict, value: str) -> Sequence[ContentBlock]:
+    """텍스트 블록: 밑줄/인라인 LaTeX/수식 패턴을 단일 스캔으로 분리."""
+    # 마크업 문자가 하나도 없으면 정규식 분리를 건너뜀
+    if len(value.translate(_MARKUP_TRANS)) == len(value):
+        return (_make_block(ContentType.TEXT, value),)
+
+    split = _split_text_block(value)
+    if len(split) > 1:
+        return split
+
+    # LaTeX 명령어(\sqrt, \frac 등)가 있으면 수식 분리
+    if '\\' in value:
         split = _split_latex_commands(value)
         if len(split) > 1:
-            return split  # type: ignore[return-value]
-
-    # 텍스트 블록에 수식 패턴이 섞여 있으면 분리
-    if content_type == ContentType.TEXT:
-        split = _split_mixed_text_equation(value)
+            return split
+        # 명령어 분리가 실패했으면 수식 패턴 분리를 재시도
+        split = _split_text_block(value, with_math=True)
         if len(split) > 1:
-            return split  # type: ignore[return-value]
+            return split
 
-    return ContentBlock(type=content_type, value=value)
+    return (_make_block(ContentType.TEXT, value),)
+
+
+# 블록 타입별 전용 처리기 (if/elif 사슬 대신 테이블 디스패치)
+_DISPATCH: dict[ContentType, Callable[[dict, str], Sequence[ContentBlock]]] = {
+    ContentType.TABLE: _handle_table_block,
+    ContentType.TEXT: _handle_text_block,
+}
+
+
+def _parse_content_block(block_data: dict) -> Sequence[ContentBlock]:
+    """콘텐츠 블록 dict를 ContentBlock 시퀀스로 변환.
+
+    항상 시퀀스를 반환하므로 호출부는 분기 없이 이어붙이면 됩니다.
+    건너뛸 블록은 빈 튜플, 보통은 길이 1, 텍스트 안에 $...$ 인라인
+    LaTeX가 있으면 분리된 여러 블록이 반환됩니다. 타입별 처리는
+    _DISPATCH 테이블에서 한 번의 조회로 결정됩니다.
+    """
+    type_str = block_data.get("type", "")
+    value = block_data.get("value", "")
+
+    if not value and type_str != "image":
+        return _EMPTY
+
+    content_type = _TYPE_MAP.get(type_str, ContentType.TEXT)
+    handler = _DISPATCH.get(content_type)
+    if handler is not None:
+        return handler(block_data, value)
+    return (_make_block(content_type, value),)
 
 
 def _split_comma_equations(blocks: list[ContentBlock]) -> list[ContentBlock]:
@@ -165,147 +314,137 @@ def _split_comma_equations(blocks: list[ContentBlock]) -> list[ContentBlock]:
                 for i, part in enumerate(valid):
                     if i > 0:
                         result.append(
-                            ContentBlock(type=ContentType.TEXT, value=", ")
+                            _mk_block(ContentType.TEXT, ", ")
                         )
                     result.append(
-                        ContentBlock(type=ContentType.EQUATION, value=part)
+                        _make_block(ContentType.EQUATION, part)
                     )
                 continue
         result.append(block)
     return result
 
 
+# 쉼표 분리에 영향을 주는 구조 문자만 골라내는 패턴
+_STRUCT_CHAR_RE = re.compile(r"[(){}\[\],]")
+
+
 def _split_at_top_level_commas(s: str) -> list[str]:
-    """최상위 레벨의 쉼표에서 분리 (괄호·중괄호 안 쉼표 무시)."""
+    """최상위 레벨의 쉼표에서 분리 (괄호·중괄호 안 쉼표 무시).
+
+    전체 문자를 파이썬 루프로 순회하는 대신 구조 문자(괄호·쉼표)만
+    정규식으로 골라 깊이를 추적하고, 결과는 슬라이싱으로 잘라냅니다.
+    """
+    if "," not in s:
+        return [s]
+
     parts: list[str] = []
     depth = 0
-    current: list[str] = []
-    for ch in s:
-        if ch in "({[":
+    start = 0
+    for m in _STRUCT_CHAR_RE.finditer(s):
+        ch = m.group()
+        if ch == ",":
+            if depth == 0:
+                parts.append(s[start:m.start()])
+                start = m.end()
+        elif ch in "({[":
             depth += 1
-        elif ch in ")}]":
+        else:
             depth = max(0, depth - 1)
-        elif ch == "," and depth == 0:
-            parts.append("".join(current))
-            current = []
-            continue
-        current.append(ch)
-    parts.append("".join(current))
+    parts.append(s[start:])
     return parts
 
 
-# 텍스트 안에서 수식 구간을 감지하는 패턴
-# 영문 변수/숫자 + 수학 연산자(=, >, <, +, -, ×, ÷, ≤, ≥, ≠) 조합
-# 예: "a > 0", "b", "x = 3", "2x + 1"
-_MATH_EXPR_RE = re.compile(
-    r'(?<![a-zA-Z])'          # 앞에 영문자 없음 (단어 중간 방지)
-    r'('
-    r'[a-zA-Z0-9]+'           # 시작: 변수/숫자
-    r'(?:'
-    r'\s*[=><+\-×÷≤≥≠^_]\s*'  # 수학 연산자
-    r'[a-zA-Z0-9]+'           # 뒤따르는 변수/숫자
-    r')*'
-    r')'
-    r'(?![a-zA-Z])'           # 뒤에 영문자 없음
-)
-
-
-def _split_mixed_text_equation(text: str) -> list[ContentBlock]:
-    """텍스트 안에 섞인 수식 패턴(영문 변수, 부등호 등)을 분리.
+def _split_text_block(
+    text: str, with_math: bool = False
+) -> list[ContentBlock]:
+    """텍스트 블록의 밑줄/인라인 LaTeX/수식 패턴을 단일 스캔으로 분리.
 
-    예: "(a > 0, b는 정수)에서"
-    → text("(") + eq("a > 0") + text(", ") + eq("b") + text("는 정수)에서")
+    분리 결과는 텍스트를 키로 메모이즈되므로(OCR 결과에는 상투구가 많이
+    반복됨) 같은 문자열은 정규식 스캔을 다시 수행하지 않습니다.
+    블록 객체는 호출마다 새로 만들어 공유 변이 문제를 피합니다.
     """
-    # 한글이 전혀 없으면 분리 불필요 (순수 텍스트거나 이미 수식)
-    if not re.search(r'[\uac00-\ud7a3]', text):
-        return [ContentBlock(type=ContentType.TEXT, value=text)]
-
-    # 수식 후보가 없으면 분리 불필요
-    if not re.search(r'[a-zA-Z0-9]', text):
-        return [ContentBlock(type=ContentType.TEXT, value=text)]
-
-    blocks: list[ContentBlock] = []
-    last_end = 0
-
-    for m in _MATH_EXPR_RE.finditer(text):
-        expr = m.group(1).strip()
-        # 너무 긴 영문 단어는 수식이 아님 (예: "정수")
-        if len(expr) > 20:
-            continue
-        # 한글이 포함된 매치는 건너뜀
-        if re.search(r'[\uac00-\ud7a3]', expr):
-            continue
-        # 단독 숫자 1자리는 문맥에 따라 건너뜀 (문제번호 등)
-        # 단, 연산자가 포함되어 있으면 수식으로 처리
-        if expr.isdigit() and len(expr) == 1:
-            continue
-
-        before = text[last_end:m.start()]
-        if before:
-            blocks.append(ContentBlock(type=ContentType.TEXT, value=before))
-        blocks.append(ContentBlock(type=ContentType.EQUATION, value=expr))
-        last_end = m.end()
-
-    after = text[last_end:]
-    if after:
-        blocks.append(ContentBlock(type=ContentType.TEXT, value=after))
-
-    return blocks if len(blocks) > 1 else [ContentBlock(type=ContentType.TEXT, value=text)]
-
-
-def _split_inline_latex(text: str) -> list[ContentBlock]:
-    """텍스트에서 $...$ 인라인 LaTeX를 분리하여 ContentBlock 리스트로 반환."""
-    blocks: list[ContentBlock] = []
-    last_end = 0
-
-    for m in _INLINE_LATEX_RE.finditer(text):
-        # 수식 앞 텍스트
-        before = text[last_end:m.start()]
-        if before:
-            blocks.append(ContentBlock(type=ContentType.TEXT, value=before))
-        # 수식
-        latex = m.group(1).strip()
-        if latex:
-            blocks.append(ContentBlock(type=ContentType.EQUATION, value=latex))
-        last_end = m.end()
-
-    # 마지막 텍스트
-    after = text[last_end:]
-    if after:
-        blocks.append(ContentBlock(type=ContentType.TEXT, value=after))
-
-    return blocks if blocks else [ContentBlock(type=ContentType.TEXT, value=text)]
-
+    return [
+        _make_block(t, v, u)
+        for t, v, u in _split_text_triples(text, with_math)
+    ]
 
-# __밑줄__ 마크업 감지 패턴
-_UNDERLINE_RE = re.compile(r"__(.+?)__")
 
+@lru_cache(maxsize=4096)
+def _split_text_triples(
+    text: str, with_math: bool = False
+) -> tuple[tuple[ContentType, str, bool], ...]:
+    """분리 결과를 (타입, 값, 밑줄) 튜플들로 계산 (캐시 대상).
 
-def _split_underline_markup(text: str) -> list[ContentBlock]:
-    """텍스트에서 __밑줄__ 마크업을 분리하여 ContentBlock 리스트로 반환.
+    기존의 밑줄 분리 → 인라인 LaTeX 분리 → 수식 분리 3회 순회를
+    통합 패턴 하나의 finditer 루프로 융합하여 문자열을 한 번만 읽습니다.
 
     예: "옳지 __않은__ 것은?"
     → text("옳지 ") + text("않은", underline=True) + text(" 것은?")
+    예: "(a > 0, b는 정수)에서"
+    → text("(") + eq("a > 0") + text(", ") + eq("b") + text("는 정수)에서")
+
+    Args:
+        text: 분리할 텍스트
+        with_math: True면 역슬래시가 있어도 수식 후보 분리를 시도
+            (LaTeX 명령어 분리가 실패한 뒤의 재시도 경로)
     """
-    blocks: list[ContentBlock] = []
+    # 수식 후보 분리 조건: 한글+영문/숫자가 섞여 있고,
+    # LaTeX 명령어(역슬래시)는 없어야 함 (명령어 분리가 우선)
+    if not with_math:
+        with_math = "\\" not in text
+    if with_math:
+        with_math = (
+            _HAS_HANGUL(text) is not None and _HAS_ALNUM(text) is not None
+        )
+
+    pattern = _COMBINED_MATH_RE if with_math else _COMBINED_RE
+    blocks: list[tuple[ContentType, str, bool]] = []
     last_end = 0
 
-    for m in _UNDERLINE_RE.finditer(text):
-        before = text[last_end:m.start()]
-        if before:
-            blocks.append(ContentBlock(type=ContentType.TEXT, value=before))
-        inner = m.group(1)
-        if inner:
-            blocks.append(
-                ContentBlock(type=ContentType.TEXT, value=inner, underline=True)
-            )
-        last_end = m.end()
+    for m in pattern.finditer(text):
+        kind = m.lastgroup
+        matched = m.group()
+
+        if kind == "under":
+            inner = matched[2:-2]  # "__" 제거
+            before = text[last_end:m.start()]
+            if before:
+                blocks.append((ContentType.TEXT, before, False))
+            if inner:
+                blocks.append((ContentType.TEXT, inner, True))
+            last_end = m.end()
+
+        elif kind == "latex":
+            latex = matched[1:-1].strip()  # "$" 제거
+            before = text[last_end:m.start()]
+            if before:
+                blocks.append((ContentType.TEXT, before, False))
+            if latex:
+                blocks.append((ContentType.EQUATION, latex, False))
+            last_end = m.end()
+
+        else:  # math
+            expr = matched
+            # 너무 긴 영문 단어는 수식이 아님
+            if len(expr) > 20:
+                continue
+            # 단독 숫자 1자리는 문맥에 따라 건너뜀 (문제번호 등)
+            # 단, 연산자가 포함되어 있으면 수식으로 처리
+            if expr.isdigit() and len(expr) == 1:
+                continue
+            before = text[last_end:m.start()]
+            if before:
+                blocks.append((ContentType.TEXT, before, False))
+            blocks.append((ContentType.EQUATION, expr, False))
+            last_end = m.end()
 
     after = text[last_end:]
     if after:
-        blocks.append(ContentBlock(type=ContentType.TEXT, value=after))
+        blocks.append((ContentType.TEXT, after, False))
 
-    return blocks if blocks else [ContentBlock(type=ContentType.TEXT, value=text)]
+    if len(blocks) > 1:
+        return tuple(blocks)
+    return ((ContentType.TEXT, text, False),)
 
 
 # ── LaTeX 명령어 감지 패턴 ──
@@ -336,14 +475,14 @@ def _split_latex_commands(text: str) -> list[ContentBlock]:
     """
     first_match = _LATEX_CMD_RE.search(text)
     if not first_match:
-        return [ContentBlock(type=ContentType.TEXT, value=text)]
+        return [_make_block(ContentType.TEXT, text)]
 
     latex_start = first_match.start()
     before = text[:latex_start]
 
     # LaTeX 영역 끝 찾기: 한글이 나오면 수식 종료
     rest = text[latex_start:]
-    korean_match = re.search(r'(?<=[^\\])\s+[\uac00-\ud7a3]', rest)
+    korean_match = _LATEX_END_HANGUL(rest)
     if korean_match:
         eq_end = latex_start + korean_match.start()
         eq_text = text[latex_start:eq_end].strip()
@@ -354,16 +493,16 @@ def _split_latex_commands(text: str) -> list[ContentBlock]:
 
     blocks: list[ContentBlock] = []
     if before.strip():
-        blocks.append(ContentBlock(type=ContentType.TEXT, value=before))
+        blocks.append(_make_block(ContentType.TEXT, before))
     if eq_text:
-        blocks.append(ContentBlock(type=ContentType.EQUATION, value=eq_text))
+        blocks.append(_make_block(ContentType.EQUATION, eq_text))
     if after_text.strip():
         # 남은 텍스트에 LaTeX가 더 있을 수 있으므로 재귀 처리
         remaining = _split_latex_commands(after_text)
         blocks.extend(remaining)
 
     return blocks if len(blocks) > 1 else [
-        ContentBlock(type=ContentType.TEXT, value=text)
+        _make_block(ContentType.TEXT, text)
     ]
 
 
@@ -6,11 +6,15 @@ python-hwpx로 문서 골격을 생성하고, lxml로 수식 XML을 직접 삽
 
 from __future__ import annotations
 
+import copy
+import hashlib
+import itertools
 import logging
-import random
+import os
 import re
 import shutil
 import zipfile
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -29,6 +33,28 @@ from core.latex_to_hwpeq import latex_to_hwpeq, latex_to_image
 
 logger = logging.getLogger(__name__)
 
+
+# ── 모듈 경계 수식 변환 캐시 ─────────────────────────────────
+# 문서 단위 캐시(HWPXWriter 인스턴스)와 별도로, 일괄 변환에서 문서를
+# 넘나드는 동일 수식의 재변환을 막습니다. 실패는 여기 캐시되지 않고
+# (lru_cache는 예외를 저장하지 않음) 문서 단위 캐시가 기록합니다.
+
+
+@lru_cache(maxsize=4096)
+def _cached_latex_to_hwpeq(latex: str) -> str:
+    return latex_to_hwpeq(latex)
+
+
+@lru_cache(maxsize=512)
+def _cached_latex_to_image(latex: str) -> bytes:
+    return latex_to_image(latex)
+
+
+def clear_equation_cache():
+    """수식 변환 캐시 비우기 (장시간 실행 프로세스용)."""
+    _cached_latex_to_hwpeq.cache_clear()
+    _cached_latex_to_image.cache_clear()
+
 # HWPX 네임스페이스
 NS = {
     "hp": "http://www.hancom.co.kr/hwpml/2011/paragraph",
@@ -41,6 +67,11 @@ NS = {
 # 원문자 ①②③④⑤
 CIRCLE_NUMBERS = {1: "\u2460", 2: "\u2461", 3: "\u2462", 4: "\u2463", 5: "\u2464"}
 
+# 접두사까지 미리 합쳐 둔 보기 라벨 (인덱스 = 보기 번호, 0은 미사용)
+# 보기마다 dict 조회 + f-string 조립을 반복하지 않기 위함
+_CHOICE_LABELS_INDENT = [None] + [f"  {CIRCLE_NUMBERS[n]} " for n in range(1, 6)]
+_CHOICE_LABELS_TAB = [None] + [f"\t{CIRCLE_NUMBERS[n]} " for n in range(1, 6)]
+
 # 우측정렬 문단 속성 ID (배점용, header.xml에 동적 추가)
 _RIGHT_ALIGN_PR_ID = "100"
 # 가운데정렬 문단 속성 ID (제목용)
@@ -49,14 +80,208 @@ _CENTER_ALIGN_PR_ID = "101"
 _UNDERLINE_CHAR_PR_ID = "7"
 
 
+def _render_eq_image(latex: str) -> bytes | None:
+    """프로세스 풀 워커: LaTeX 수식을 PNG로 렌더링 (실패 시 None)."""
+    try:
+        return latex_to_image(latex)
+    except Exception:
+        return None
+
+
 def _qn(prefix: str, local: str) -> str:
     """Clark notation으로 네임스페이스 태그 생성."""
     return f"{{{NS[prefix]}}}{local}"
 
 
-def _random_id() -> str:
-    """랜덤 ID 생성 (HWPX 요소용)."""
-    return str(random.randint(100000000, 4294967295))
+# 핫 패스에서 반복 생성되는 hp 태그의 Clark 표기 상수
+# (_qn은 호출마다 dict 조회 + f-string 포맷을 수행하므로 미리 계산)
+_HP_P = _qn("hp", "p")
+_HP_RUN = _qn("hp", "run")
+_HP_T = _qn("hp", "t")
+_HP_SECPR = _qn("hp", "secPr")
+_HP_LINESEGARRAY = _qn("hp", "linesegarray")
+_HP_LINESEG = _qn("hp", "lineseg")
+_HP_EQUATION = _qn("hp", "equation")
+_HP_SZ = _qn("hp", "sz")
+_HP_POS = _qn("hp", "pos")
+_HP_OUTMARGIN = _qn("hp", "outMargin")
+_HP_SHAPECOMMENT = _qn("hp", "shapeComment")
+_HP_SCRIPT = _qn("hp", "script")
+_HP_CTRL = _qn("hp", "ctrl")
+_HP_TBL = _qn("hp", "tbl")
+_HP_TR = _qn("hp", "tr")
+_HP_TC = _qn("hp", "tc")
+_HP_SUBLIST = _qn("hp", "subList")
+_HP_CELLADDR = _qn("hp", "cellAddr")
+_HP_CELLSPAN = _qn("hp", "cellSpan")
+_HP_CELLSZ = _qn("hp", "cellSz")
+_HP_CELLMARGIN = _qn("hp", "cellMargin")
+_HP_INMARGIN = _qn("hp", "inMargin")
+_HP_PIC = _qn("hp", "pic")
+_HP_IMGRECT = _qn("hp", "imgRect")
+_HP_IMGCLIP = _qn("hp", "imgClip")
+_HP_IMGDATA = _qn("hp", "imgData")
+
+# 문단 하위의 secPr 존재 여부를 한 번에 찾는 컴파일드 XPath
+_SECPR_XPATH = etree.XPath("./descendant::hp:secPr", namespaces={"hp": NS["hp"]})
+
+# secPr을 품은 직계 문단을 단일 호출로 찾는 컴파일드 XPath
+_SECPR_PARA_XPATH = etree.XPath(
+    "hp:p[descendant::hp:secPr]", namespaces={"hp": NS["hp"]}
+)
+
+# 골격 문단에서 제거할 빈 텍스트 run (secPr 없는 run 중 t가 공백뿐인 것)
+_EMPTY_RUN_XPATH = etree.XPath(
+    "hp:run[not(hp:secPr) and hp:t"
+    " and string-length(normalize-space(hp:t)) = 0]",
+    namespaces={"hp": NS["hp"]},
+)
+
+# 수식 요소의 고정 속성 (문서마다 동일 — id/zOrder/baseLine 등 동적 값만 호출부에서 병합)
+_EQ_CONST_ATTRS = {
+    "numberingType": "EQUATION",
+    "textWrap": "TOP_AND_BOTTOM",
+    "textFlow": "BOTH_SIDES",
+    "lock": "0",
+    "dropcapstyle": "None",
+    "version": "Equation Version 60",
+    "textColor": "#000000",
+    "baseUnit": "1000",
+    "lineMode": "CHAR",
+    "font": "HYhwpEQ",
+}
+
+# ShapeSize — 자동 스케일링 유도를 위해 0 할당 (렌더링 왜곡 및 여백 과다 생성 방지)
+_EQ_SZ_ATTRS = {
+    "width": "0",
+    "height": "0",
+    "widthRelTo": "ABSOLUTE",
+    "heightRelTo": "ABSOLUTE",
+    "protect": "0",
+}
+
+# ShapePosition — 글자처럼 취급 (인라인)
+_EQ_POS_ATTRS = {
+    "treatAsChar": "1",
+    "affectLSpacing": "1",
+    "flowWithText": "1",
+    "allowOverlap": "0",
+    "holdAnchorAndSO": "0",
+    "vertRelTo": "PARA",
+    "horzRelTo": "PARA",
+    "vertAlign": "TOP",
+    "horzAlign": "LEFT",
+    "vertOffset": "0",
+    "horzOffset": "0",
+}
+
+# 외부 여백 (실제 한컴 기준: left=56, right=56)
+_EQ_OUTMARGIN_ATTRS = {"left": "56", "right": "56", "top": "0", "bottom": "0"}
+
+# 표 요소의 고정 속성 (id/rowCnt/colCnt 등 동적 값만 호출부에서 병합)
+_TBL_CONST_ATTRS = {
+    "zOrder": "0",
+    "numberingType": "TABLE",
+    "textWrap": "TOP_AND_BOTTOM",
+    "textFlow": "BOTH_SIDES",
+    "lock": "0",
+    "dropcapstyle": "None",
+    "pageBreak": "CELL",
+    "repeatHeader": "0",
+    "cellSpacing": "0",
+    "borderFillIDRef": "3",
+    "noAdjust": "0",
+}
+
+# 표 위치 — 글자처럼 취급
+_TBL_POS_ATTRS = {
+    "treatAsChar": "1",
+    "affectLSpacing": "0",
+    "flowWithText": "1",
+    "allowOverlap": "0",
+    "holdAnchorAndSO": "0",
+    "vertRelTo": "PARA",
+    "horzRelTo": "COLUMN",
+    "vertAlign": "TOP",
+    "horzAlign": "LEFT",
+    "vertOffset": "0",
+    "horzOffset": "0",
+}
+
+_TBL_MARGIN_ATTRS = {"left": "0", "right": "0", "top": "0", "bottom": "0"}
+
+_TC_ATTRS = {
+    "name": "",
+    "header": "0",
+    "hasMargin": "0",
+    "protect": "0",
+    "editable": "0",
+    "dirty": "0",
+    "borderFillIDRef": "3",
+}
+
+_SUBLIST_ATTRS = {
+    "id": "",
+    "textDirection": "HORIZONTAL",
+    "lineWrap": "BREAK",
+    "vertAlign": "CENTER",
+    "linkListIDRef": "0",
+    "linkListNextIDRef": "0",
+    "textWidth": "0",
+    "textHeight": "0",
+    "hasTextRef": "0",
+    "hasNumRef": "0",
+}
+
+_CELL_SPAN_ATTRS = {"colSpan": "1", "rowSpan": "1"}
+
+# 수식 없는 문단용 기본 linesegarray (textheight=1000, baseline=850).
+# 대부분의 문단이 이 형태이므로 한 번만 파싱해 두고 deepcopy로 붙입니다
+# (lxml의 deepcopy는 C 레벨 복사라 SubElement+set 반복보다 저렴).
+_LINESEG_TEMPLATE = etree.fromstring(
+    f'<hp:linesegarray xmlns:hp="{NS["hp"]}">'
+    '<hp:lineseg textpos="0" vertpos="0" vertsize="1000" textheight="1000"'
+    ' baseline="850" spacing="500" horzpos="0" horzsize="42520"'
+    ' flags="393216"/></hp:linesegarray>'
+)
+
+
+def _build_eq_run_template() -> etree._Element:
+    """수식 run 서브트리 템플릿 구성 (모듈 로드 시 1회).
+
+    id/zOrder/baseLine/예상 높이와 스크립트 본문만 수식마다 다르므로,
+    고정 구조는 한 번 만들어 두고 삽입 시 deepcopy합니다.
+    """
+    run = etree.Element(
+        _HP_RUN, attrib={"charPrIDRef": "0"}, nsmap={"hp": NS["hp"]}
+    )
+    eq = etree.SubElement(
+        run, _HP_EQUATION, attrib={**_EQ_CONST_ATTRS, "baseLine": "85"}
+    )
+    etree.SubElement(eq, _HP_SZ, attrib=_EQ_SZ_ATTRS)
+    etree.SubElement(eq, _HP_POS, attrib=_EQ_POS_ATTRS)
+    etree.SubElement(eq, _HP_OUTMARGIN, attrib=_EQ_OUTMARGIN_ATTRS)
+    # 수식 주석
+    etree.SubElement(eq, _HP_SHAPECOMMENT).text = "수식입니다."
+    # 수식 스크립트 (삽입 시 본문 채움)
+    etree.SubElement(eq, _HP_SCRIPT)
+    return run
+
+
+_EQ_RUN_TEMPLATE = _build_eq_run_template()
+
+
+# hwpx 패키지는 첫 사용 시점에 한 번만 import (배치 변환 시 재조회 생략)
+_HwpxDocument = None
+
+
+def _get_hwpx_document_cls():
+    """HwpxDocument 클래스를 지연 로드하여 캐시."""
+    global _HwpxDocument
+    if _HwpxDocument is None:
+        from hwpx import HwpxDocument
+        _HwpxDocument = HwpxDocument
+    return _HwpxDocument
 
 
 # 기호로 렌더링되는 HWP 명령어 (1문자 기호로 치환됨)
@@ -163,8 +388,9 @@ _HWPEQ_KEYWORD_WIDTHS: dict[str, int] = {
 }
 
 
+@lru_cache(maxsize=2048)
 def _extract_latex_brace(s: str) -> tuple[str, str]:
-    """LaTeX 문자열에서 첫 번째 {content}를 추출.
+    """LaTeX 문자열에서 첫 번째 {content}를 추출 (입력 문자열로 캐시).
 
     Returns:
         (content, rest_of_string)
@@ -260,8 +486,29 @@ def _measure_hwpeq_width(script: str, scale: float = 1.0) -> float:
     return width
 
 
+_MPL_CTX: tuple | None = None
+
+
+def _get_mpl_ctx() -> tuple:
+    """측정용 matplotlib Figure/renderer 싱글턴.
+
+    Figure + Agg 캔버스 구성은 수식마다 반복하기엔 비싸므로
+    최초 호출 시 한 번만 만들어 재사용합니다.
+    """
+    global _MPL_CTX
+    if _MPL_CTX is None:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=(10, 2), dpi=72)
+        canvas = FigureCanvasAgg(fig)
+        _MPL_CTX = (fig, canvas.get_renderer())
+    return _MPL_CTX
+
+
+@lru_cache(maxsize=4096)
 def _measure_latex_size(latex: str) -> tuple[int, int] | None:
-    """matplotlib로 LaTeX 수식의 렌더링 크기를 측정.
+    """matplotlib로 LaTeX 수식의 렌더링 크기를 측정 (LaTeX 문자열로 캐시).
 
     분수(\\frac) 포함 시 분자·분모를 개별 측정하여 합성합니다.
     HWP의 HYhwpEQ 폰트는 matplotlib 기본 폰트보다 좁으므로
@@ -274,12 +521,7 @@ def _measure_latex_size(latex: str) -> tuple[int, int] | None:
     HWP_SCALE = 0.65
 
     try:
-        from matplotlib.backends.backend_agg import FigureCanvasAgg
-        from matplotlib.figure import Figure
-
-        fig = Figure(figsize=(10, 2), dpi=72)
-        canvas = FigureCanvasAgg(fig)
-        renderer = canvas.get_renderer()
+        fig, renderer = _get_mpl_ctx()
 
         def mpl_width(expr: str, fontsize: float = 10.0) -> int:
             """LaTeX 식의 렌더링 너비를 hwpunit로 반환."""
@@ -405,19 +647,25 @@ def _estimate_equation_size(hwp_eq_script: str) -> tuple[int, int]:
     return (width, height)
 
 
+# 키워드 → 치환 문자 매핑과 단일 통합 패턴 (_visual_char_count 전용).
+# 기호는 1문자(G), 대형 연산자는 넓은 문자(W), 구조 명령어는 제거.
+# 긴 키워드가 우선 매치되도록 길이 내림차순 정렬.
+_KW_REPL: dict[str, str] = {kw: "G" for kw in _SYMBOL_KEYWORDS}
+_KW_REPL.update({kw: "W" for kw in _LARGE_OP_KEYWORDS})
+_KW_REPL.update({kw: "" for kw in _STRUCT_KEYWORDS})
+_KW_RE = re.compile(
+    "|".join(re.escape(kw) for kw in sorted(_KW_REPL, key=len, reverse=True))
+)
+
+
 def _visual_char_count(text: str) -> float:
     """HWP 수식 스크립트의 가시 문자 수 (폴백용).
 
     공백도 0.30 가중치로 포함 (HWP 수식 공백은 문자 폭의 약 30%).
     위첨자/아래첨자 문자는 0.50 가중치 (축소 렌더링).
     """
-    s = text
-    for kw in _SYMBOL_KEYWORDS:
-        s = s.replace(kw, "G")
-    for kw in _LARGE_OP_KEYWORDS:
-        s = s.replace(kw, "W")
-    for cmd in _STRUCT_KEYWORDS:
-        s = s.replace(cmd, "")
+    # 기호/연산자/구조 키워드를 단일 스캔으로 치환 (키워드별 전체 순회 방지)
+    s = _KW_RE.sub(lambda m: _KW_REPL[m.group()], text)
 
     sup_sub_chars = 0
     for m in re.finditer(r'[\^_]\{([^{}]*)\}', s):
@@ -438,13 +686,76 @@ def _visual_char_count(text: str) -> float:
     return max(base + sup_sub_chars * 0.50, 1.0)
 
 
+# 템플릿별 정리된 섹션 골격 캐시: (경로, mtime_ns) → (골격 bytes, header bytes)
+# 일괄 변환에서 같은 템플릿을 문서마다 다시 읽고 정리하지 않기 위함
+_TEMPLATE_CACHE: dict[tuple[str, int], tuple[bytes, bytes]] = {}
+
+
+def _get_template_shell(source_path: Path) -> tuple[bytes, bytes]:
+    """템플릿의 정리된 section0.xml 골격과 header.xml 바이트를 반환.
+
+    골격은 내용 문단이 제거되고 secPr 문단만 남은 상태입니다
+    (보존 문단의 빈 run·linesegarray도 정리됨). 템플릿 파일이
+    수정되면 mtime_ns가 바뀌어 캐시가 자연히 무효화됩니다.
+    """
+    key = (str(source_path), source_path.stat().st_mtime_ns)
+    cached = _TEMPLATE_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    with zipfile.ZipFile(str(source_path), "r") as zf:
+        section_bytes = zf.read("Contents/section0.xml")
+        header_bytes = zf.read("Contents/header.xml")
+
+    root = etree.fromstring(section_bytes)
+
+    # secPr이 포함된 첫 문단 찾기 (섹션 전체를 XPath 한 번으로 탐색)
+    secpr_paras = _SECPR_PARA_XPATH(root)
+    first_para_with_secpr = secpr_paras[0] if secpr_paras else None
+
+    for p in root.findall(_HP_P):
+        if p is first_para_with_secpr:
+            # 자식을 한 번만 순회하며 제거 대상 분류:
+            # secPr 없는 run과 linesegarray(새로 생성할 것)만 제거
+            to_remove = [
+                child
+                for child in p
+                if (child.tag == _HP_RUN and not _SECPR_XPATH(child))
+                or child.tag == _HP_LINESEGARRAY
+            ]
+            for child in to_remove:
+                p.remove(child)
+        else:
+            root.remove(p)
+
+    shell_bytes = etree.tostring(root, xml_declaration=True, encoding="UTF-8")
+    _TEMPLATE_CACHE[key] = (shell_bytes, header_bytes)
+    return shell_bytes, header_bytes
+
+
 class HWPXWriter:
     """HWPX 문서 생성기."""
 
-    def __init__(self):
-        self._image_counter = 0
+    def __init__(self, compresslevel: int = 6):
+        """
+        Args:
+            compresslevel: 출력 ZIP의 DEFLATE 압축 레벨 (1~9).
+                반복 변환·미리보기처럼 저장이 잦은 경우 1을 주면
+                압축 CPU가 수 배 줄어드는 대신 파일이 10~15% 커집니다.
+        """
+        self._compresslevel = compresslevel
         self._eq_counter = 0
         self._embedded_images: dict[str, bytes] = {}  # bindata id → image bytes
+        # 동일 LaTeX 반복 변환 방지 캐시 (문서 단위).
+        # None은 변환 실패 기록 — 같은 수식의 실패를 반복 시도하지 않음
+        self._hwpeq_cache: dict[str, str | None] = {}
+        self._eq_image_cache: dict[str, bytes | None] = {}
+        # 이번 쓰기에서 생성되어 linesegarray가 필요한 문단 목록
+        # (_ensure_linesegarray가 섹션 전체를 재탐색하지 않도록 추적)
+        self._pending_paras: list[etree._Element] = []
+        # 요소 ID: 문서 내 유일성만 필요하므로 고정 기점에서 단조 증가.
+        # 문서마다 같은 기점에서 시작 → 동일 입력이면 바이트 동일 출력
+        self._id_counter = itertools.count(100_000_001)
 
     def write(
         self,
@@ -465,31 +776,85 @@ class HWPXWriter:
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
+        self._prefetch_equations(document)
+
         if template and template.is_valid:
             return self._write_with_template(document, output_path, template)
         else:
             return self._write_default(document, output_path)
 
+    @staticmethod
+    def _collect_equations(document: ExamDocument) -> set[str]:
+        """문서 내 모든 수식 블록의 LaTeX 문자열 수집 (중복 제거)."""
+        latexes: set[str] = set()
+
+        def visit(question: Question):
+            for block in question.contents:
+                if block.is_equation:
+                    latexes.add(block.value)
+            for choice in question.choices:
+                for block in choice.contents:
+                    if block.is_equation:
+                        latexes.add(block.value)
+            for sub in question.sub_questions:
+                visit(sub)
+
+        for page in document.pages:
+            for question in page.questions:
+                visit(question)
+        return latexes
+
+    def _prefetch_equations(self, document: ExamDocument):
+        """트리 구성 전에 수식 변환 캐시를 미리 채움.
+
+        네이티브 변환(latex_to_hwpeq)은 순수 파이썬이라 순차 수행하고,
+        변환에 실패해 이미지 폴백이 필요한 수식만 프로세스 풀에서
+        병렬 렌더링합니다 (matplotlib 래스터화가 CPU 지배적).
+        이후 _insert_equation은 캐시 조회만 수행합니다.
+        """
+        fallbacks = []
+        for latex in self._collect_equations(document):
+            if latex in self._hwpeq_cache:
+                continue
+            try:
+                self._hwpeq_cache[latex] = _cached_latex_to_hwpeq(latex)
+            except Exception as e:
+                logger.warning("수식 변환 실패, 이미지 폴백: %s (%s)", latex, e)
+                self._hwpeq_cache[latex] = None
+                if latex not in self._eq_image_cache:
+                    fallbacks.append(latex)
+
+        if not fallbacks:
+            return
+        if len(fallbacks) == 1:
+            # 워커 기동 비용이 더 큼 — 제자리 렌더링
+            self._eq_image_cache[fallbacks[0]] = _render_eq_image(fallbacks[0])
+            return
+
+        import concurrent.futures
+
+        workers = min(len(fallbacks), os.cpu_count() or 2)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            for latex, img in zip(fallbacks, pool.map(_render_eq_image, fallbacks)):
+                self._eq_image_cache[latex] = img
+
     def _write_default(self, document: ExamDocument, output_path: Path) -> Path:
         """기본 서식으로 HWPX 파일 생성 (기존 동작)."""
-        from hwpx import HwpxDocument
-        doc = HwpxDocument.new()
+        doc = _get_hwpx_document_cls().new()
 
         # 첫 번째 섹션 가져오기
         section = doc.sections[0]
         sec_elem = section.element
 
         # 기존 문단 처리: secPr이 포함된 첫 문단은 유지하고 나머지 제거
-        existing_paras = sec_elem.findall(_qn("hp", "p"))
+        existing_paras = sec_elem.findall(_HP_P)
         for i, p in enumerate(existing_paras):
             if i == 0:
-                # 첫 문단(secPr 포함)은 유지 - 텍스트 run만 정리
-                for run in p.findall(_qn("hp", "run")):
-                    # secPr이 없는 빈 run 제거
-                    if run.find(_qn("hp", "secPr")) is None:
-                        t_elem = run.find(_qn("hp", "t"))
-                        if t_elem is not None and not (t_elem.text and t_elem.text.strip()):
-                            p.remove(run)
+                # 첫 문단(secPr 포함)은 유지 - 빈 텍스트 run만 C 레벨 필터로 정리
+                for run in _EMPTY_RUN_XPATH(p):
+                    p.remove(run)
+                # 골격 문단에 linesegarray가 없을 수 있으므로 보장 대상으로 등록
+                self._pending_paras.append(p)
             else:
                 sec_elem.remove(p)
 
@@ -508,12 +873,14 @@ class HWPXWriter:
         section.mark_dirty()
         doc.save_to_path(str(output_path))
 
-        # 우측정렬 paraPr 추가 (배점용)
-        self._inject_right_align_parapr(output_path)
-
-        # 수식 이미지가 있으면 ZIP에 추가
-        if self._embedded_images:
-            self._inject_images_to_zip(output_path)
+        # 정렬 속성·수식 이미지를 단일 ZIP 재작성으로 반영
+        with zipfile.ZipFile(str(output_path), "r") as zf:
+            header_bytes = zf.read("Contents/header.xml")
+        self._finalize_zip(
+            output_path,
+            replacements=self._build_replacements(header_bytes),
+            additions=self._image_additions(),
+        )
 
         logger.info("HWPX 파일 저장 완료: %s", output_path)
         return output_path
@@ -524,53 +891,28 @@ class HWPXWriter:
         output_path: Path,
         template: TemplateConfig,
     ) -> Path:
-        """템플릿 HWPX를 복사하여 내용만 교체.
+        """템플릿 HWPX의 내용만 교체하여 출력 파일로 스트리밍.
 
         전략:
-        1. 템플릿 HWPX를 output 경로에 복사
-        2. ZIP 내부의 section0.xml에서 내용 문단만 제거 (secPr 보존)
+        1. 템플릿 ZIP에서 section0.xml·header.xml만 읽기 (파일 복사 없음)
+        2. section0.xml에서 내용 문단만 제거 (secPr 보존)
         3. 새 OCR 결과를 section0.xml에 삽입
-        4. header.xml은 그대로 유지 → 글꼴·스타일 정의 보존
+        4. 템플릿 엔트리를 출력 ZIP으로 직접 스트리밍하며 교체분만 대체
+           → header.xml의 글꼴·스타일 정의 보존
         """
         logger.info("템플릿 기반 변환: %s", template.source_path.name)
 
-        # 1. 템플릿 파일을 output에 복사
-        shutil.copy2(str(template.source_path), str(output_path))
-
-        # 2. ZIP에서 section0.xml 읽기
-        with zipfile.ZipFile(str(output_path), "r") as zf:
-            section_bytes = zf.read("Contents/section0.xml")
+        # 1~2. 정리된 섹션 골격 확보 (같은 템플릿 반복 사용 시 캐시 재사용)
+        shell_bytes, header_bytes = _get_template_shell(template.source_path)
 
-        # 3. section0.xml 파싱 → 내용 교체
-        root = etree.fromstring(section_bytes)
+        # 3. 골격 파싱 → 내용 삽입 준비
+        root = etree.fromstring(shell_bytes)
         sec_elem = root  # section0.xml의 루트가 곧 섹션 요소
 
-        # secPr이 포함된 첫 문단 찾기 & 보존
-        first_para_with_secpr = None
-        all_paras = list(sec_elem.findall(_qn("hp", "p")))
-
-        for p in all_paras:
-            has_secpr = False
-            for elem in p.iter():
-                if elem.tag and "secPr" in elem.tag:
-                    has_secpr = True
-                    break
-            if has_secpr and first_para_with_secpr is None:
-                first_para_with_secpr = p
-                # secPr 문단의 텍스트 run만 제거 (secPr 자체는 보존)
-                for run in list(p.findall(_qn("hp", "run"))):
-                    has_secpr_child = False
-                    for child in run.iter():
-                        if child.tag and "secPr" in child.tag:
-                            has_secpr_child = True
-                            break
-                    if not has_secpr_child:
-                        p.remove(run)
-                # linesegarray 제거 (새로 생성할 것)
-                for lsa in list(p.findall(_qn("hp", "linesegarray"))):
-                    p.remove(lsa)
-            else:
-                sec_elem.remove(p)
+        # 보존된 secPr 문단은 linesegarray가 제거된 상태 → 재생성 대상으로 등록
+        secpr_paras = _SECPR_PARA_XPATH(sec_elem)
+        if secpr_paras:
+            self._pending_paras.append(secpr_paras[0])
 
         # 4. 새 내용 삽입
         if document.title:
@@ -582,36 +924,92 @@ class HWPXWriter:
         # 5. linesegarray 보장
         self._ensure_linesegarray(sec_elem)
 
-        # 6. 수정된 section0.xml을 ZIP에 다시 기록
+        # 6. 템플릿 → 출력으로 직접 스트리밍하며 변경 엔트리만 교체
+        # 새로 삽입한 요소들이 요소마다 ns 선언을 달지 않도록 루트로 끌어올림
+        etree.cleanup_namespaces(root, top_nsmap=NS)
         new_section_bytes = etree.tostring(
             root, xml_declaration=True, encoding="UTF-8"
         )
-        self._replace_in_zip(output_path, "Contents/section0.xml", new_section_bytes)
-
-        # 우측정렬 paraPr 추가 (배점용)
-        self._inject_right_align_parapr(output_path)
-
-        # 수식 이미지가 있으면 ZIP에 추가
-        if self._embedded_images:
-            self._inject_images_to_zip(output_path)
+        replacements = self._build_replacements(header_bytes)
+        replacements["Contents/section0.xml"] = new_section_bytes
+        self._stream_zip(
+            template.source_path,
+            output_path,
+            replacements=replacements,
+            additions=self._image_additions(),
+        )
 
         logger.info("템플릿 기반 HWPX 파일 저장 완료: %s", output_path)
         return output_path
 
-    @staticmethod
-    def _replace_in_zip(zip_path: Path, entry_name: str, new_data: bytes):
-        """ZIP 파일 내 특정 엔트리를 교체."""
+    def _build_replacements(self, header_bytes: bytes) -> dict[str, bytes]:
+        """저장 후 교체할 ZIP 엔트리(경로 → 바이트) 수집."""
+        replacements: dict[str, bytes] = {}
+        new_header = self._header_with_style_props(header_bytes)
+        if new_header is not None:
+            replacements["Contents/header.xml"] = new_header
+        return replacements
+
+    def _image_additions(self) -> dict[str, bytes]:
+        """ZIP에 새로 추가할 수식 이미지 엔트리 수집."""
+        return {
+            f"BinData/{filename}": data
+            for filename, data in self._embedded_images.items()
+        }
+
+    def _finalize_zip(
+        self,
+        zip_path: Path,
+        replacements: dict[str, bytes] | None = None,
+        additions: dict[str, bytes] | None = None,
+    ):
+        """ZIP을 한 번만 다시 써서 엔트리 교체·추가를 일괄 적용.
+
+        header/section 교체와 BinData 이미지 추가가 각각 전체 재작성을
+        반복하지 않도록, 모든 변경을 모아 단일 패스로 기록합니다.
+        """
+        if not replacements and not additions:
+            return
         temp_path = zip_path.with_suffix(".hwpx.tmp")
+        self._stream_zip(zip_path, temp_path, replacements, additions)
+        # 임시 파일이 결과 파일 옆에 있으므로 같은 파일시스템이 보장됨
+        # → os.replace는 단일 rename 시스템콜이며 원자적으로 교체됩니다.
+        os.replace(temp_path, zip_path)
 
-        with zipfile.ZipFile(str(zip_path), "r") as zin:
-            with zipfile.ZipFile(str(temp_path), "w") as zout:
-                for item in zin.infolist():
-                    if item.filename == entry_name:
-                        zout.writestr(item, new_data)
-                    else:
-                        zout.writestr(item, zin.read(item.filename))
+    def _stream_zip(
+        self,
+        src_path: Path,
+        dst_path: Path,
+        replacements: dict[str, bytes] | None = None,
+        additions: dict[str, bytes] | None = None,
+    ):
+        """원본 ZIP의 엔트리를 출력 ZIP으로 스트리밍하며 교체·추가 적용.
 
-        shutil.move(str(temp_path), str(zip_path))
+        중간 파일 복사 없이 원본을 읽기 전용으로 열고, 교체 대상이 아닌
+        엔트리는 64KiB 단위로 스트리밍 복사합니다 (ZipInfo 재사용으로
+        메타데이터 유지, 전체 바이트를 메모리에 올리지 않음).
+        """
+        replacements = replacements or {}
+
+        with zipfile.ZipFile(str(src_path), "r") as zin:
+            # 1MiB 쓰기 버퍼 — 작은 엔트리가 많을 때 시스템콜 횟수 절감
+            with open(dst_path, "wb", buffering=1 << 20) as raw, zipfile.ZipFile(
+                raw, "w", compresslevel=self._compresslevel
+            ) as zout:
+                for item in zin.infolist():
+                    data = replacements.get(item.filename)
+                    if data is not None:
+                        zout.writestr(item, data)
+                        continue
+                    with zin.open(item, "r") as fsrc, \
+                            zout.open(item, "w") as fdst:
+                        shutil.copyfileobj(fsrc, fdst, length=64 * 1024)
+                if additions:
+                    for entry_name, data in additions.items():
+                        # PNG은 내부적으로 이미 DEFLATE 압축이므로 재압축 없이 저장
+                        info = zipfile.ZipInfo(entry_name)
+                        info.compress_type = zipfile.ZIP_STORED
+                        zout.writestr(info, data)
 
     def _add_title_paragraph(self, sec_elem: etree._Element, title: str):
         """제목 문단 추가 (가운데 정렬).
@@ -654,49 +1052,57 @@ class HWPXWriter:
             prev_was_mc = bool(question.choices)
 
     def _write_question(self, sec_elem: etree._Element, question: Question):
-        """문제 하나를 삽입."""
-        is_essay = not question.choices
-
-        # 문제 본문 첫 줄에 번호 포함
-        p_elem = self._create_paragraph(sec_elem)
-
-        # 번호 run
-        run = self._create_run(p_elem, char_pr_id="1")
-        self._set_run_text(run, f"{question.number}. ")
-
-        # 본문 내용
-        for block in question.contents:
-            self._write_content_block(sec_elem, p_elem, block)
+        """문제 하나를 삽입 (소문항 포함, 명시적 스택으로 순회).
 
-        # 배점 추가: 공간 있으면 같은 줄, 없으면 별도 우측정렬 문단
-        if question.score:
-            line_width = self._estimate_last_line_width(question)
-            LINE_CAPACITY = 42520
-            SCORE_WIDTH = 3500  # [수식+점] 예상 너비
-            if line_width + SCORE_WIDTH < LINE_CAPACITY:
-                self._write_score_inline(p_elem, question.score)
-            else:
-                score_para = self._create_paragraph(
-                    sec_elem, para_pr_id=_RIGHT_ALIGN_PR_ID
-                )
-                self._write_score_inline(
-                    score_para, question.score, leading_space=False
-                )
-
-        # 선택지 (객관식)
-        if question.choices:
-            self._write_choices(sec_elem, question.choices)
-
-        # 소문항
-        for sub in question.sub_questions:
-            self._write_question(sec_elem, sub)
-
-        # 서술형: 풀이 공간 추가
-        if is_essay:
-            self._write_essay_space(sec_elem)
+        각 문제는 (본문 단계, 마무리 단계)의 두 단계로 처리됩니다 —
+        소문항을 모두 쓴 뒤에 풀이 공간과 빈 줄이 와야 하기 때문입니다.
+        """
+        # (question, 마무리 단계 여부) LIFO 스택
+        stack: list[tuple[Question, bool]] = [(question, False)]
+        while stack:
+            q, finishing = stack.pop()
+            if finishing:
+                # 서술형: 풀이 공간 추가
+                if not q.choices:
+                    self._write_essay_space(sec_elem)
+                # 문제 간 빈 줄
+                self._create_paragraph(sec_elem)
+                continue
 
-        # 문제 간 빈 줄
-        self._create_paragraph(sec_elem)
+            # 문제 본문 첫 줄에 번호 포함
+            p_elem = self._create_paragraph(sec_elem)
+
+            # 번호 run
+            run = self._create_run(p_elem, char_pr_id="1")
+            self._set_run_text(run, f"{q.number}. ")
+
+            # 본문 내용
+            for block in q.contents:
+                self._write_content_block(sec_elem, p_elem, block)
+
+            # 배점 추가: 공간 있으면 같은 줄, 없으면 별도 우측정렬 문단
+            if q.score:
+                line_width = self._estimate_last_line_width(q)
+                LINE_CAPACITY = 42520
+                SCORE_WIDTH = 3500  # [수식+점] 예상 너비
+                if line_width + SCORE_WIDTH < LINE_CAPACITY:
+                    self._write_score_inline(p_elem, q.score)
+                else:
+                    score_para = self._create_paragraph(
+                        sec_elem, para_pr_id=_RIGHT_ALIGN_PR_ID
+                    )
+                    self._write_score_inline(
+                        score_para, q.score, leading_space=False
+                    )
+
+            # 선택지 (객관식)
+            if q.choices:
+                self._write_choices(sec_elem, q.choices)
+
+            # 소문항을 먼저 처리한 뒤 이 문제의 마무리 단계 수행
+            stack.append((q, True))
+            for sub in reversed(q.sub_questions):
+                stack.append((sub, False))
 
     def _write_essay_space(self, sec_elem: etree._Element):
         """서술형 문제 아래에 풀이 공간 삽입."""
@@ -778,19 +1184,25 @@ class HWPXWriter:
                 batch = choices[i:i + items_per_line]
                 p_elem = self._create_paragraph(sec_elem)
                 for j, choice in enumerate(batch):
-                    circle = CIRCLE_NUMBERS.get(choice.number, f"({choice.number})")
-                    prefix = "  " if j == 0 else "\t"
+                    n = choice.number
+                    if 1 <= n <= 5:
+                        labels = _CHOICE_LABELS_INDENT if j == 0 else _CHOICE_LABELS_TAB
+                        label = labels[n]
+                    else:
+                        prefix = "  " if j == 0 else "\t"
+                        label = f"{prefix}({n}) "
                     run = self._create_run(p_elem)
-                    self._set_run_text(run, f"{prefix}{circle} ")
+                    self._set_run_text(run, label)
                     for block in choice.contents:
                         self._write_content_block(sec_elem, p_elem, block)
 
     def _write_single_choice(self, sec_elem: etree._Element, choice: Choice):
         """선택지 하나를 독립 줄에 삽입."""
         p_elem = self._create_paragraph(sec_elem)
-        circle = CIRCLE_NUMBERS.get(choice.number, f"({choice.number})")
+        n = choice.number
+        label = _CHOICE_LABELS_INDENT[n] if 1 <= n <= 5 else f"  ({n}) "
         run = self._create_run(p_elem)
-        self._set_run_text(run, f"  {circle} ")
+        self._set_run_text(run, label)
         for block in choice.contents:
             self._write_content_block(sec_elem, p_elem, block)
 
@@ -860,131 +1272,91 @@ class HWPXWriter:
 
         # 테이블을 포함할 문단 생성
         p_elem = self._create_paragraph(sec_elem)
-        run = etree.SubElement(p_elem, _qn("hp", "run"))
-        run.set("charPrIDRef", "0")
+        run = etree.SubElement(p_elem, _HP_RUN, attrib={"charPrIDRef": "0"})
 
         # <hp:tbl> 요소
-        tbl = etree.SubElement(run, _qn("hp", "tbl"))
-        tbl.set("id", _random_id())
-        tbl.set("zOrder", "0")
-        tbl.set("numberingType", "TABLE")
-        tbl.set("textWrap", "TOP_AND_BOTTOM")
-        tbl.set("textFlow", "BOTH_SIDES")
-        tbl.set("lock", "0")
-        tbl.set("dropcapstyle", "None")
-        tbl.set("pageBreak", "CELL")
-        tbl.set("repeatHeader", "0")
-        tbl.set("rowCnt", str(row_cnt))
-        tbl.set("colCnt", str(col_cnt))
-        tbl.set("cellSpacing", "0")
-        tbl.set("borderFillIDRef", "3")
-        tbl.set("noAdjust", "0")
+        tbl = etree.SubElement(run, _HP_TBL, attrib={
+            **_TBL_CONST_ATTRS,
+            "id": self._next_id(),
+            "rowCnt": str(row_cnt),
+            "colCnt": str(col_cnt),
+        })
 
         # <hp:sz> 테이블 크기
-        sz = etree.SubElement(tbl, _qn("hp", "sz"))
-        sz.set("width", str(TABLE_WIDTH))
-        sz.set("widthRelTo", "ABSOLUTE")
-        sz.set("height", str(table_height))
-        sz.set("heightRelTo", "ABSOLUTE")
-        sz.set("protect", "0")
+        etree.SubElement(tbl, _HP_SZ, attrib={
+            "width": str(TABLE_WIDTH),
+            "widthRelTo": "ABSOLUTE",
+            "height": str(table_height),
+            "heightRelTo": "ABSOLUTE",
+            "protect": "0",
+        })
 
         # <hp:pos> 위치 — 글자처럼 취급
-        pos = etree.SubElement(tbl, _qn("hp", "pos"))
-        pos.set("treatAsChar", "1")
-        pos.set("affectLSpacing", "0")
-        pos.set("flowWithText", "1")
-        pos.set("allowOverlap", "0")
-        pos.set("holdAnchorAndSO", "0")
-        pos.set("vertRelTo", "PARA")
-        pos.set("horzRelTo", "COLUMN")
-        pos.set("vertAlign", "TOP")
-        pos.set("horzAlign", "LEFT")
-        pos.set("vertOffset", "0")
-        pos.set("horzOffset", "0")
+        etree.SubElement(tbl, _HP_POS, attrib=_TBL_POS_ATTRS)
 
         # <hp:outMargin>, <hp:inMargin>
-        for margin_name in ("outMargin", "inMargin"):
-            m = etree.SubElement(tbl, _qn("hp", margin_name))
-            m.set("left", "0")
-            m.set("right", "0")
-            m.set("top", "0")
-            m.set("bottom", "0")
+        for margin_tag in (_HP_OUTMARGIN, _HP_INMARGIN):
+            etree.SubElement(tbl, margin_tag, attrib=_TBL_MARGIN_ATTRS)
 
         # 행/열 생성
         for row_idx, row_data in enumerate(rows):
-            tr = etree.SubElement(tbl, _qn("hp", "tr"))
+            tr = etree.SubElement(tbl, _HP_TR)
 
             # 열 수 맞추기 (부족한 열은 빈 문자열로)
             padded_row = list(row_data) + [""] * (col_cnt - len(row_data))
 
             for col_idx, cell_text in enumerate(padded_row):
-                tc = etree.SubElement(tr, _qn("hp", "tc"))
-                tc.set("name", "")
-                tc.set("header", "0")
-                tc.set("hasMargin", "0")
-                tc.set("protect", "0")
-                tc.set("editable", "0")
-                tc.set("dirty", "0")
-                tc.set("borderFillIDRef", "3")
+                tc = etree.SubElement(tr, _HP_TC, attrib=_TC_ATTRS)
 
                 # <hp:subList> — 셀 내용 컨테이너
-                sub_list = etree.SubElement(tc, _qn("hp", "subList"))
-                sub_list.set("id", "")
-                sub_list.set("textDirection", "HORIZONTAL")
-                sub_list.set("lineWrap", "BREAK")
-                sub_list.set("vertAlign", "CENTER")
-                sub_list.set("linkListIDRef", "0")
-                sub_list.set("linkListNextIDRef", "0")
-                sub_list.set("textWidth", "0")
-                sub_list.set("textHeight", "0")
-                sub_list.set("hasTextRef", "0")
-                sub_list.set("hasNumRef", "0")
+                sub_list = etree.SubElement(tc, _HP_SUBLIST, attrib=_SUBLIST_ATTRS)
 
                 # 셀 내 문단
-                cell_p = etree.SubElement(sub_list, _qn("hp", "p"))
-                cell_p.set("id", _random_id())
-                cell_p.set("paraPrIDRef", "0")
-                cell_p.set("styleIDRef", "0")
-                cell_p.set("pageBreak", "0")
-                cell_p.set("columnBreak", "0")
-                cell_p.set("merged", "0")
-
-                cell_run = etree.SubElement(cell_p, _qn("hp", "run"))
-                cell_run.set("charPrIDRef", "0")
-                cell_t = etree.SubElement(cell_run, _qn("hp", "t"))
+                cell_p = etree.SubElement(sub_list, _HP_P, attrib={
+                    "id": self._next_id(),
+                    "paraPrIDRef": "0",
+                    "styleIDRef": "0",
+                    "pageBreak": "0",
+                    "columnBreak": "0",
+                    "merged": "0",
+                })
+
+                cell_run = etree.SubElement(
+                    cell_p, _HP_RUN, attrib={"charPrIDRef": "0"}
+                )
+                cell_t = etree.SubElement(cell_run, _HP_T)
                 cell_t.text = cell_text if cell_text else ""
 
                 # linesegarray
-                lsa = etree.SubElement(cell_p, _qn("hp", "linesegarray"))
-                ls = etree.SubElement(lsa, _qn("hp", "lineseg"))
-                ls.set("textpos", "0")
-                ls.set("vertpos", "0")
-                ls.set("vertsize", "1000")
-                ls.set("textheight", "1000")
-                ls.set("baseline", "850")
-                ls.set("spacing", "600")
-                ls.set("horzpos", "0")
-                ls.set("horzsize", str(col_width))
-                ls.set("flags", "393216")
+                lsa = etree.SubElement(cell_p, _HP_LINESEGARRAY)
+                etree.SubElement(lsa, _HP_LINESEG, attrib={
+                    "textpos": "0",
+                    "vertpos": "0",
+                    "vertsize": "1000",
+                    "textheight": "1000",
+                    "baseline": "850",
+                    "spacing": "600",
+                    "horzpos": "0",
+                    "horzsize": str(col_width),
+                    "flags": "393216",
+                })
 
                 # 셀 속성
-                cell_addr = etree.SubElement(tc, _qn("hp", "cellAddr"))
-                cell_addr.set("colAddr", str(col_idx))
-                cell_addr.set("rowAddr", str(row_idx))
-
-                cell_span = etree.SubElement(tc, _qn("hp", "cellSpan"))
-                cell_span.set("colSpan", "1")
-                cell_span.set("rowSpan", "1")
-
-                cell_sz = etree.SubElement(tc, _qn("hp", "cellSz"))
-                cell_sz.set("width", str(col_width))
-                cell_sz.set("height", str(ROW_HEIGHT))
-
-                cell_margin = etree.SubElement(tc, _qn("hp", "cellMargin"))
-                cell_margin.set("left", str(CELL_MARGIN))
-                cell_margin.set("right", str(CELL_MARGIN))
-                cell_margin.set("top", str(CELL_MARGIN))
-                cell_margin.set("bottom", str(CELL_MARGIN))
+                etree.SubElement(tc, _HP_CELLADDR, attrib={
+                    "colAddr": str(col_idx), "rowAddr": str(row_idx),
+                })
+                etree.SubElement(tc, _HP_CELLSPAN, attrib=_CELL_SPAN_ATTRS)
+                etree.SubElement(tc, _HP_CELLSZ, attrib={
+                    "width": str(col_width), "height": str(ROW_HEIGHT),
+                })
+                cm = str(CELL_MARGIN)
+                etree.SubElement(tc, _HP_CELLMARGIN, attrib={
+                    "left": cm, "right": cm, "top": cm, "bottom": cm,
+                })
+
+    def _next_id(self) -> str:
+        """고유 ID 생성 (HWPX 요소용)."""
+        return str(next(self._id_counter))
 
     def _insert_equation(self, p_elem: etree._Element, latex: str):
         """수식을 문단에 삽입.
@@ -992,19 +1364,36 @@ class HWPXWriter:
         1차: HWP 네이티브 수식 삽입 (크기 자동 지정)
         2차: 수식 변환 실패 시 이미지 폴백
         """
-        try:
-            hwp_eq = latex_to_hwpeq(latex)
+        if latex in self._hwpeq_cache:
+            hwp_eq = self._hwpeq_cache[latex]
+        else:
+            try:
+                hwp_eq = _cached_latex_to_hwpeq(latex)
+            except Exception as e:
+                logger.warning("수식 변환 실패, 이미지 폴백: %s (%s)", latex, e)
+                hwp_eq = None
+            self._hwpeq_cache[latex] = hwp_eq
+
+        if hwp_eq is not None:
             self._inject_equation_xml(p_elem, hwp_eq)
-        except Exception as e:
-            logger.warning("수식 변환 실패, 이미지 폴백: %s (%s)", latex, e)
+            return
+
+        if latex in self._eq_image_cache:
+            img_data = self._eq_image_cache[latex]
+        else:
             try:
-                img_data = latex_to_image(latex)
-                self._inject_equation_image(p_elem, img_data, latex)
-            except Exception as e2:
-                logger.error("수식 이미지 생성도 실패: %s (%s)", latex, e2)
-                # 최후 수단: LaTeX 텍스트 그대로 삽입
-                run = self._create_run(p_elem)
-                self._set_run_text(run, f"[{latex}]")
+                img_data = _cached_latex_to_image(latex)
+            except Exception as e:
+                logger.error("수식 이미지 생성도 실패: %s (%s)", latex, e)
+                img_data = None
+            self._eq_image_cache[latex] = img_data
+
+        if img_data is not None:
+            self._inject_equation_image(p_elem, img_data, latex)
+        else:
+            # 최후 수단: LaTeX 텍스트 그대로 삽입
+            run = self._create_run(p_elem)
+            self._set_run_text(run, f"[{latex}]")
 
     def _inject_equation_xml(
         self,
@@ -1024,66 +1413,19 @@ class HWPXWriter:
         if size is None:
             size = _estimate_equation_size(hwp_eq_script)
 
-        run = etree.SubElement(p_elem, _qn("hp", "run"))
-        run.set("charPrIDRef", "0")
-
-        eq = etree.SubElement(run, _qn("hp", "equation"))
-        eq.set("id", _random_id())
+        run = copy.deepcopy(_EQ_RUN_TEMPLATE)
+        eq = run[0]
+        eq.set("id", self._next_id())
         eq.set("zOrder", str(self._eq_counter))
-        eq.set("numberingType", "EQUATION")
-        eq.set("textWrap", "TOP_AND_BOTTOM")
-        eq.set("textFlow", "BOTH_SIDES")
-        eq.set("lock", "0")
-        eq.set("dropcapstyle", "None")
-        eq.set("version", "Equation Version 60")
         # 분수는 분수선이 텍스트 기준선에 오도록 baseLine=50
-        has_frac = "over" in hwp_eq_script or "atop" in hwp_eq_script
-        eq.set("baseLine", "50" if has_frac else "85")
-        eq.set("textColor", "#000000")
-        eq.set("baseUnit", "1000")
-        eq.set("lineMode", "CHAR")
-        eq.set("font", "HYhwpEQ")
-
-        # ShapeSize — 자동 스케일링 유도를 위해 0 할당 (렌더링 왜곡 및 여백 과다 생성 방지)
-        est_width, est_height = size
-        sz = etree.SubElement(eq, _qn("hp", "sz"))
-        sz.set("width", "0")
-        sz.set("height", "0")
-        sz.set("widthRelTo", "ABSOLUTE")
-        sz.set("heightRelTo", "ABSOLUTE")
-        sz.set("protect", "0")
-        
+        if "over" in hwp_eq_script or "atop" in hwp_eq_script:
+            eq.set("baseLine", "50")
         # 줄간격 중첩 방지 로직 보존용 임시 높이 데이터 은닉 보관
+        est_width, est_height = size
         eq.set("data-est-height", str(est_height))
-
-        # ShapePosition — 글자처럼 취급 (인라인)
-        pos = etree.SubElement(eq, _qn("hp", "pos"))
-        pos.set("treatAsChar", "1")
-        pos.set("affectLSpacing", "1")
-        pos.set("flowWithText", "1")
-        pos.set("allowOverlap", "0")
-        pos.set("holdAnchorAndSO", "0")
-        pos.set("vertRelTo", "PARA")
-        pos.set("horzRelTo", "PARA")
-        pos.set("vertAlign", "TOP")
-        pos.set("horzAlign", "LEFT")
-        pos.set("vertOffset", "0")
-        pos.set("horzOffset", "0")
-
-        # 외부 여백 (실제 한컴 기준: left=56, right=56)
-        out_margin = etree.SubElement(eq, _qn("hp", "outMargin"))
-        out_margin.set("left", "56")
-        out_margin.set("right", "56")
-        out_margin.set("top", "0")
-        out_margin.set("bottom", "0")
-
-        # 수식 주석
-        shape_comment = etree.SubElement(eq, _qn("hp", "shapeComment"))
-        shape_comment.text = "수식입니다."
-
-        # 수식 스크립트
-        script = etree.SubElement(eq, _qn("hp", "script"))
-        script.text = hwp_eq_script
+        # 수식 스크립트 본문 (템플릿의 마지막 자식)
+        eq[-1].text = hwp_eq_script
+        p_elem.append(run)
 
     def _inject_equation_image(
         self, p_elem: etree._Element, img_data: bytes, alt_text: str
@@ -1091,63 +1433,45 @@ class HWPXWriter:
         """수식 이미지를 문단에 인라인 삽입 (폴백).
 
         이미지를 bindata로 ZIP에 포함하고 참조합니다.
+        같은 바이트의 이미지는 내용 해시 기반 파일명으로 한 번만 수록됩니다.
         """
-        self._image_counter += 1
-        img_id = f"eq_img_{self._image_counter}"
-        filename = f"{img_id}.png"
+        digest = hashlib.blake2b(img_data, digest_size=12).hexdigest()
+        filename = f"eq_{digest}.png"
 
-        # 이미지 바이트 저장 (나중에 ZIP에 추가)
-        self._embedded_images[filename] = img_data
+        # 이미지 바이트 저장 (나중에 ZIP에 추가, 동일 내용은 공유)
+        if filename not in self._embedded_images:
+            self._embedded_images[filename] = img_data
 
         # 인라인 이미지 XML
-        run = etree.SubElement(p_elem, _qn("hp", "run"))
-        run.set("charPrIDRef", "0")
-
-        ctrl = etree.SubElement(run, _qn("hp", "ctrl"))
-        pic = etree.SubElement(ctrl, _qn("hp", "pic"))
-        pic.set("id", _random_id())
-        pic.set("width", "5000")  # 대략적 크기 (HWP unit)
-        pic.set("height", "2000")
-
-        img_rect = etree.SubElement(pic, _qn("hp", "imgRect"))
-        img_rect.set("x", "0")
-        img_rect.set("y", "0")
-        img_rect.set("cx", "5000")
-        img_rect.set("cy", "2000")
-
-        img_clip = etree.SubElement(pic, _qn("hp", "imgClip"))
-        img_clip.set("left", "0")
-        img_clip.set("top", "0")
-        img_clip.set("right", "0")
-        img_clip.set("bottom", "0")
-
-        img_data_elem = etree.SubElement(pic, _qn("hp", "imgData"))
-        img_data_elem.text = f"BinData/{filename}"
+        run = etree.SubElement(p_elem, _HP_RUN, attrib={"charPrIDRef": "0"})
 
-    def _inject_images_to_zip(self, hwpx_path: Path):
-        """저장된 HWPX ZIP 파일에 수식 이미지를 추가."""
-        temp_path = hwpx_path.with_suffix(".hwpx.tmp")
+        ctrl = etree.SubElement(run, _HP_CTRL)
+        # 대략적 크기 (HWP unit)
+        pic = etree.SubElement(ctrl, _HP_PIC, attrib={
+            "id": self._next_id(),
+            "width": "5000",
+            "height": "2000",
+        })
 
-        with zipfile.ZipFile(str(hwpx_path), "r") as zin:
-            with zipfile.ZipFile(str(temp_path), "w") as zout:
-                # 기존 파일 복사
-                for item in zin.infolist():
-                    zout.writestr(item, zin.read(item.filename))
+        etree.SubElement(pic, _HP_IMGRECT, attrib={
+            "x": "0", "y": "0", "cx": "5000", "cy": "2000",
+        })
 
-                # 이미지 추가
-                for filename, data in self._embedded_images.items():
-                    zout.writestr(f"BinData/{filename}", data)
+        etree.SubElement(pic, _HP_IMGCLIP, attrib={
+            "left": "0", "top": "0", "right": "0", "bottom": "0",
+        })
 
-        # 원본 교체
-        shutil.move(str(temp_path), str(hwpx_path))
+        img_data_elem = etree.SubElement(pic, _HP_IMGDATA)
+        img_data_elem.text = f"BinData/{filename}"
 
     @staticmethod
-    def _inject_right_align_parapr(zip_path: Path):
-        """header.xml에 우측정렬·가운데정렬 문단 속성 + 밑줄 문자 속성을 추가."""
-        HH = "http://www.hancom.co.kr/hwpml/2011/head"
+    def _header_with_style_props(header_bytes: bytes) -> bytes | None:
+        """header.xml에 우측정렬·가운데정렬 문단 속성 + 밑줄 문자 속성을 추가.
 
-        with zipfile.ZipFile(str(zip_path), "r") as zf:
-            header_bytes = zf.read("Contents/header.xml")
+        Returns:
+            수정된 header.xml 바이트, 변경이 없으면 None.
+        """
+        HH = "http://www.hancom.co.kr/hwpml/2011/head"
 
         root = etree.fromstring(header_bytes)
         import copy
@@ -1205,16 +1529,13 @@ class HWPXWriter:
                     modified = True
 
         if not modified:
-            return
+            return None
 
-        new_header = etree.tostring(
-            root, xml_declaration=True, encoding="UTF-8"
-        )
-        HWPXWriter._replace_in_zip(zip_path, "Contents/header.xml", new_header)
+        etree.cleanup_namespaces(root)
+        return etree.tostring(root, xml_declaration=True, encoding="UTF-8")
 
-    @staticmethod
-    def _ensure_linesegarray(sec_elem: etree._Element):
-        """모든 문단에 linesegarray가 있는지 확인하고, 없으면 추가.
+    def _ensure_linesegarray(self, sec_elem: etree._Element):
+        """생성된 문단에 linesegarray가 있는지 확인하고, 없으면 추가.
 
         한글(HWP)은 모든 <hp:p>에 <hp:linesegarray>를 필수로 요구합니다.
         linesegarray는 문단의 마지막 자식으로 위치해야 합니다.
@@ -1223,21 +1544,21 @@ class HWPXWriter:
         위쪽/아래쪽 확장량을 계산하여 줄 겹침을 방지합니다.
         baseLine은 수식 상단에서 텍스트 기준선까지의 비율(0~100)입니다.
         """
-        eq_tag = _qn("hp", "equation")
-        sz_tag = _qn("hp", "sz")
         TEXT_BASE_HEIGHT = 1000  # 기본 텍스트 줄 높이
         TEXT_BASELINE = 850     # 기본 텍스트 기준선 (상단에서 85%)
 
-        for p in sec_elem.findall(_qn("hp", "p")):
-            if p.find(_qn("hp", "linesegarray")) is not None:
+        # 섹션 전체 findall 대신, 이번 쓰기에서 생성·등록된 문단만 순회
+        pending, self._pending_paras = self._pending_paras, []
+        for p in pending:
+            if p.find(_HP_LINESEGARRAY) is not None:
                 continue
 
             # 문단 내 수식의 above/below 기준선 확장량 계산
             max_above = TEXT_BASELINE  # 텍스트 기준선 위 최대 높이
             max_below = TEXT_BASE_HEIGHT - TEXT_BASELINE  # 기준선 아래 최대 높이
 
-            for eq in p.iter(eq_tag):
-                sz = eq.find(sz_tag)
+            for eq in p.iter(_HP_EQUATION):
+                sz = eq.find(_HP_SZ)
                 if sz is None:
                     continue
                     
@@ -1259,36 +1580,43 @@ class HWPXWriter:
                 max_above = max(max_above, eq_above)
                 max_below = max(max_below, eq_below)
 
+            if max_above == TEXT_BASELINE and max_below == TEXT_BASE_HEIGHT - TEXT_BASELINE:
+                # 수식 확장이 없는 기본 문단: 미리 파싱한 템플릿 복사
+                p.append(copy.deepcopy(_LINESEG_TEMPLATE))
+                continue
+
             textheight = max_above + max_below
             baseline = max_above
             spacing = int(textheight * 0.50)
 
-            lsa = etree.SubElement(p, _qn("hp", "linesegarray"))
-            ls = etree.SubElement(lsa, _qn("hp", "lineseg"))
-            ls.set("textpos", "0")
-            ls.set("vertpos", "0")
-            ls.set("vertsize", str(textheight))
-            ls.set("textheight", str(textheight))
-            ls.set("baseline", str(baseline))
-            ls.set("spacing", str(spacing))
-            ls.set("horzpos", "0")
-            ls.set("horzsize", "42520")
-            ls.set("flags", "393216")
+            lsa = etree.SubElement(p, _HP_LINESEGARRAY)
+            etree.SubElement(lsa, _HP_LINESEG, attrib={
+                "textpos": "0",
+                "vertpos": "0",
+                "vertsize": str(textheight),
+                "textheight": str(textheight),
+                "baseline": str(baseline),
+                "spacing": str(spacing),
+                "horzpos": "0",
+                "horzsize": "42520",
+                "flags": "393216",
+            })
 
     # ─── 저수준 XML 헬퍼 ─────────────────────────────────────
 
-    @staticmethod
     def _create_paragraph(
-        parent: etree._Element, para_pr_id: str = "0", style_id: str = "0"
+        self, parent: etree._Element, para_pr_id: str = "0", style_id: str = "0"
     ) -> etree._Element:
         """문단 요소 생성."""
-        p = etree.SubElement(parent, _qn("hp", "p"))
-        p.set("id", _random_id())
-        p.set("paraPrIDRef", para_pr_id)
-        p.set("styleIDRef", style_id)
-        p.set("pageBreak", "0")
-        p.set("columnBreak", "0")
-        p.set("merged", "0")
+        p = etree.SubElement(parent, _HP_P, attrib={
+            "id": self._next_id(),
+            "paraPrIDRef": para_pr_id,
+            "styleIDRef": style_id,
+            "pageBreak": "0",
+            "columnBreak": "0",
+            "merged": "0",
+        })
+        self._pending_paras.append(p)
         return p
 
     @staticmethod
@@ -1296,14 +1624,14 @@ class HWPXWriter:
         p_elem: etree._Element, char_pr_id: str = "0"
     ) -> etree._Element:
         """텍스트 run 요소 생성."""
-        run = etree.SubElement(p_elem, _qn("hp", "run"))
-        run.set("charPrIDRef", char_pr_id)
-        return run
+        return etree.SubElement(
+            p_elem, _HP_RUN, attrib={"charPrIDRef": char_pr_id}
+        )
 
     @staticmethod
     def _set_run_text(run: etree._Element, text: str):
         """run 요소에 텍스트 설정."""
-        t = etree.SubElement(run, _qn("hp", "t"))
+        t = etree.SubElement(run, _HP_T)
         t.text = text
 
 
@@ -1311,6 +1639,7 @@ def write_exam_to_hwpx(
     document: ExamDocument,
     output_path: str | Path,
     template_path: str | Path | None = None,
+    compresslevel: int = 6,
 ) -> Path:
     """편의 함수: ExamDocument를 HWPX 파일로 저장.
 
@@ -1318,6 +1647,7 @@ def write_exam_to_hwpx(
         document: 변환할 시험 문서
         output_path: 출력 파일 경로
         template_path: 양식 HWPX 파일 경로 (None이면 기본 서식)
+        compresslevel: 출력 ZIP 압축 레벨 (반복 저장 시 1 권장)
 
     Returns:
         저장된 파일 경로
@@ -1327,5 +1657,5 @@ def write_exam_to_hwpx(
         from core.template_loader import load_template
         template = load_template(template_path)
 
-    writer = HWPXWriter()
+    writer = HWPXWriter(compresslevel=compresslevel)
     return writer.write(document, output_path, template=template)
@@ -17,6 +17,18 @@
 from __future__ import annotations
 
 import re
+import threading
+from functools import lru_cache
+
+try:
+    # 선택 의존성: regex 모듈이 있으면 재귀 패턴으로 중괄호 그룹을
+    # 역추적 없이 선형 시간에 매치한다 (중첩 깊이 제한도 사라짐)
+    import regex as _re
+
+    _HAS_REGEX = True
+except ImportError:
+    _re = re
+    _HAS_REGEX = False
 
 
 class LaTeXToHWPConverter:
@@ -228,34 +240,45 @@ class LaTeXToHWPConverter:
         r"\widetilde": "TILDE",
     }
 
+    # 알터네이션 문자열은 임포트 시점에 한 번만 조립.
+    # 길이 내림차순 정렬로 최장 일치 우선을 보장 (\tilde가 \widetilde를 가리는 류 방지)
+    _ACCENT_ALT = "|".join(
+        re.escape(k[1:]) for k in sorted(ACCENT_MAP, key=len, reverse=True)
+    )
+    _BIG_OP_ALT = "|".join(
+        sorted(
+            ("sum", "prod", "coprod", "int", "iint", "iiint",
+             "oint", "bigcup", "bigcap"),
+            key=len, reverse=True,
+        )
+    )
+    _ENV_ALT = "cases|pmatrix|bmatrix|vmatrix|matrix"
+
     def __init__(self):
         self._build_patterns()
+        # 변환 단위(convert 호출) 내 하위 표현식 메모이제이션 캐시.
+        # 동일 페이지의 수식은 {x}, {n}, {i=0} 같은 부분식을 반복 포함
+        self._expr_cache: dict[str, str] = {}
 
     def _build_patterns(self):
         """정규식 패턴 사전 컴파일."""
-        # \frac{a}{b}, \dfrac{a}{b}, \tfrac{a}{b}
-        self._frac_pattern = re.compile(
-            r"\\[dt]?frac\s*" + self._brace_group("num") + r"\s*" + self._brace_group("den")
-        )
-        # \sqrt[n]{x} 또는 \sqrt{x}
-        self._sqrt_n_pattern = re.compile(
-            r"\\sqrt\s*\[([^\]]+)\]\s*" + self._brace_group("body")
-        )
-        self._sqrt_pattern = re.compile(r"\\sqrt\s*" + self._brace_group("body"))
+        # \frac·\sqrt·\binom은 명령어 토큰만 정규식으로 찾고,
+        # 중괄호 그룹은 선형 스캐너(_find_brace_group)로 추출합니다
+        # (중첩 중괄호를 흉내 낸 3단 알터네이션의 역추적 비용 회피)
+        self._frac_cmd = re.compile(r"\\[dt]?frac")
+        self._sqrt_cmd = re.compile(r"\\sqrt\s*(?:\[([^\]]+)\])?")
+        self._binom_cmd = re.compile(r"\\binom")
 
         # \sum, \prod, \int 등 대형 연산자
-        self._big_op_pattern = re.compile(
-            r"\\(sum|prod|coprod|int|iint|iiint|oint|bigcup|bigcap)"
+        self._big_op_pattern = _re.compile(
+            r"\\(" + self._BIG_OP_ALT + r")"
             r"(?:\s*_\s*" + self._brace_group_or_char("lo") + r")?"
             r"(?:\s*\^\s*" + self._brace_group_or_char("hi") + r")?"
         )
 
         # accent: \vec{A}, \bar{x} 등
-        accent_cmds = "|".join(
-            re.escape(k[1:]) for k in self.ACCENT_MAP
-        )
-        self._accent_pattern = re.compile(
-            r"\\(" + accent_cmds + r")\s*" + self._brace_group("body")
+        self._accent_pattern = _re.compile(
+            r"\\(" + self._ACCENT_ALT + r")\s*" + self._brace_group("body")
         )
 
         # \left( ... \right)
@@ -265,51 +288,290 @@ class LaTeXToHWPConverter:
         )
 
         # 상첨자/하첨자
-        self._superscript = re.compile(r"\^\s*" + self._brace_group_or_char("sup"))
-        self._subscript = re.compile(r"_\s*" + self._brace_group_or_char("sub"))
+        self._superscript = _re.compile(r"\^\s*" + self._brace_group_or_char("sup"))
+        self._subscript = _re.compile(r"_\s*" + self._brace_group_or_char("sub"))
 
         # \text{...}
-        self._text_pattern = re.compile(r"\\text\s*" + self._brace_group("txt"))
+        self._text_pattern = _re.compile(r"\\text\s*" + self._brace_group("txt"))
         # \mathrm{...}
-        self._mathrm_pattern = re.compile(r"\\mathrm\s*" + self._brace_group("txt"))
+        self._mathrm_pattern = _re.compile(r"\\mathrm\s*" + self._brace_group("txt"))
         # \mathbf{...}
-        self._mathbf_pattern = re.compile(r"\\mathbf\s*" + self._brace_group("txt"))
+        self._mathbf_pattern = _re.compile(r"\\mathbf\s*" + self._brace_group("txt"))
+
+        # 그리스 문자·기호·함수명: 단일 알터네이션으로 한 번에 치환.
+        # (?![a-zA-Z])로 접두 충돌 방지 (예: \in vs \inf) — 길이 정렬 불필요
+        cmd_map = {**self.GREEK_MAP, **self.SYMBOL_MAP, **self.FUNC_MAP}
+        self._cmd_table = {k[1:]: v for k, v in cmd_map.items()}
+        self._cmd_pattern = re.compile(
+            r"\\("
+            + "|".join(
+                re.escape(k)
+                for k in sorted(self._cmd_table, key=len, reverse=True)
+            )
+            + r")(?![a-zA-Z])"
+        )
 
-        # \binom{n}{k}
-        self._binom_pattern = re.compile(
-            r"\\binom\s*" + self._brace_group("top") + r"\s*" + self._brace_group("bot")
+        # displaymath 구분자 \[ \] \( \) 및 정렬 환경 래퍼 제거용
+        self._displaymath_re = re.compile(r"\\[\[\]()]")
+        self._env_strip_pattern = re.compile(
+            r"\\(?:begin|end)\{(?:equation|align|gather|displaymath)\*?\}"
         )
+        # 다중 공백 정리 (후처리)
+        self._multispace_pattern = re.compile(r" {2,}")
+
+        # 단순 { } 그룹 (중첩 없음)
+        self._simple_brace_pattern = re.compile(r"\{([^{}]+)\}")
+
+        # 후처리: 공백 명령 치환 + 남은 명령어 제거를 한 번의 스캔으로 처리
+        # (qquad를 quad보다 먼저 매칭해야 하므로 알터네이션 순서 유지)
+        self._cleanup_pattern = re.compile(r"\\(qquad|quad|,|;|!|\\|[a-zA-Z]+)")
 
         # \begin{env}...\end{env} (행렬/조건식)
         self._env_pattern = re.compile(
-            r"\\begin\{(cases|pmatrix|bmatrix|vmatrix|matrix)\}"
+            r"\\begin\{(" + self._ENV_ALT + r")\}"
             r"\s*(.*?)\s*"
             r"\\end\{\1\}",
             re.DOTALL,
         )
 
     @staticmethod
-    def _brace_group(name: str) -> str:
-        """Named group for {content} - handles up to 3 levels of nesting."""
-        # 각 단계가 한 단계 더 깊은 중괄호를 허용
-        L0 = r"[^{}]*"
-        L1 = r"(?:[^{}]|\{" + L0 + r"\})*"
-        L2 = r"(?:[^{}]|\{" + L1 + r"\})*"
-        L3 = r"(?:[^{}]|\{" + L2 + r"\})*"
-        return r"\{(?P<" + name + r">" + L3 + r")\}"
+    def _find_brace_group(s: str, i: int) -> tuple[str, int] | None:
+        """s[i:]에서 공백을 건너뛴 뒤 {내용}을 선형 스캔으로 추출.
+
+        Returns:
+            (내용, 닫는 중괄호 다음 인덱스), 중괄호 그룹이 없으면 None
+        """
+        n = len(s)
+        while i < n and s[i].isspace():
+            i += 1
+        if i >= n or s[i] != "{":
+            return None
+        depth = 0
+        for j in range(i, n):
+            c = s[j]
+            if c == "{":
+                depth += 1
+            elif c == "}":
+                depth -= 1
+                if depth == 0:
+                    return (s[i + 1 : j], j + 1)
+        return None
+
+    def _apply_frac(self, s: str) -> str:
+        """\frac{a}{b} → {a} over {b} (좌→우 선형 변환)."""
+        out: list[str] = []
+        pos = 0
+        while True:
+            m = self._frac_cmd.search(s, pos)
+            if m is None:
+                break
+            g1 = self._find_brace_group(s, m.end())
+            if g1 is None:
+                out.append(s[pos : m.end()])
+                pos = m.end()
+                continue
+            num, j = g1
+            g2 = self._find_brace_group(s, j)
+            if g2 is None:
+                out.append(s[pos:j])
+                pos = j
+                continue
+            den, end = g2
+            out.append(s[pos : m.start()])
+            out.append(
+                "{" + self._convert_expr(num)
+                + "} over {" + self._convert_expr(den) + "}"
+            )
+            pos = end
+        out.append(s[pos:])
+        return "".join(out)
+
+    def _apply_sqrt(self, s: str) -> str:
+        """\sqrt{x} → sqrt {x}, \sqrt[n]{x} → root {n} of {x}."""
+        out: list[str] = []
+        pos = 0
+        while True:
+            m = self._sqrt_cmd.search(s, pos)
+            if m is None:
+                break
+            g = self._find_brace_group(s, m.end())
+            if g is None:
+                out.append(s[pos : m.end()])
+                pos = m.end()
+                continue
+            body, end = g
+            out.append(s[pos : m.start()])
+            idx = m.group(1)
+            if idx is not None:
+                out.append(
+                    "root {" + self._convert_expr(idx)
+                    + "} of {" + self._convert_expr(body) + "}"
+                )
+            else:
+                out.append("sqrt {" + self._convert_expr(body) + "}")
+            pos = end
+        out.append(s[pos:])
+        return "".join(out)
+
+    def _apply_binom(self, s: str) -> str:
+        """\binom{n}{k} → LEFT ( {n} atop {k} RIGHT )."""
+        out: list[str] = []
+        pos = 0
+        while True:
+            m = self._binom_cmd.search(s, pos)
+            if m is None:
+                break
+            g1 = self._find_brace_group(s, m.end())
+            if g1 is None:
+                out.append(s[pos : m.end()])
+                pos = m.end()
+                continue
+            top, j = g1
+            g2 = self._find_brace_group(s, j)
+            if g2 is None:
+                out.append(s[pos:j])
+                pos = j
+                continue
+            bot, end = g2
+            out.append(s[pos : m.start()])
+            out.append(
+                "LEFT ( {" + self._convert_expr(top)
+                + "} atop {" + self._convert_expr(bot) + "} RIGHT )"
+            )
+            pos = end
+        out.append(s[pos:])
+        return "".join(out)
 
     @staticmethod
-    def _brace_group_or_char(name: str) -> str:
-        """Named group for {content} or single char."""
+    def _nested_braces(name: str) -> str:
+        """중괄호 그룹 내용 서브패턴 (regex 모듈이 있으면 재귀, 없으면 3단 중첩)."""
+        if _HAS_REGEX:
+            # (?&name) 서브루틴 호출로 임의 깊이를 선형 시간에 매치
+            return r"(?:[^{}]|\{(?&" + name + r")\})*"
+        # stdlib re 폴백: 각 단계가 한 단계 더 깊은 중괄호를 허용
         L0 = r"[^{}]*"
         L1 = r"(?:[^{}]|\{" + L0 + r"\})*"
         L2 = r"(?:[^{}]|\{" + L1 + r"\})*"
-        L3 = r"(?:[^{}]|\{" + L2 + r"\})*"
+        return r"(?:[^{}]|\{" + L2 + r"\})*"
+
+    @classmethod
+    def _brace_group(cls, name: str) -> str:
+        """Named group for {content}."""
+        return r"\{(?P<" + name + r">" + cls._nested_braces(name) + r")\}"
+
+    @classmethod
+    def _brace_group_or_char(cls, name: str) -> str:
+        """Named group for {content} or single char."""
         return (
-            r"(?:\{(?P<" + name + r">" + L3 + r")\}"
+            r"(?:\{(?P<" + name + r">" + cls._nested_braces(name) + r")\}"
             r"|(?P<" + name + r"_c>[^\s{}\\]))"
         )
 
+    # 환경/연산자/구분자 매핑 (치환 메서드에서 공유)
+    _ENV_MAP = {
+        "cases": "CASES",
+        "pmatrix": "PMATRIX",
+        "bmatrix": "BMATRIX",
+        "vmatrix": "DMATRIX",
+        "matrix": "MATRIX",
+    }
+    _BIG_OP_MAP = {
+        "SUM": "SUM", "PROD": "PROD", "COPROD": "COPROD",
+        "INT": "INT", "IINT": "DINT", "IIINT": "TINT", "OINT": "OINT",
+        "BIGCUP": "UNION", "BIGCAP": "INTER",
+    }
+    _DELIM_MAP = {
+        "(": "(", ")": ")", "[": "[", "]": "]",
+        r"\{": "lbrace", r"\}": "rbrace",
+        "{": "lbrace", "}": "rbrace",
+        "|": "|", ".": "",
+    }
+
+    def _cmd_repl(self, m: re.Match) -> str:
+        """명령어 알터네이션 매치를 HWP 표기로 치환."""
+        return self._cmd_table[m.group(1)]
+
+    # ─── sub() 치환 메서드 (호출마다 클로저를 새로 만들지 않도록 바운드 메서드 사용) ───
+
+    def _env_repl(self, m: re.Match) -> str:
+        """행렬/조건식 환경을 HWP 환경 표기로 치환."""
+        env = m.group(1)
+        content = m.group(2)
+        hwp_env = self._ENV_MAP[env]
+        # \\ → # (행 구분자 변환)
+        content = re.sub(r"\\\\", " # ", content)
+        content = self._convert_expr(content)
+        return hwp_env + " {" + content + "}"
+
+    def _text_repl(self, m: re.Match) -> str:
+        return '"' + m.group("txt") + '"'
+
+    def _mathrm_repl(self, m: re.Match) -> str:
+        return "rm " + m.group("txt")
+
+    def _mathbf_repl(self, m: re.Match) -> str:
+        return "bold " + m.group("txt")
+
+    def _big_op_repl(self, m: re.Match) -> str:
+        """대형 연산자(합/적분 등)를 첨자와 함께 치환."""
+        op = m.group(1).upper()
+        hwp_op = self._BIG_OP_MAP.get(op, op)
+        lo = self._get_match(m, "lo")
+        hi = self._get_match(m, "hi")
+        result = hwp_op
+        if lo:
+            result += " _{" + self._convert_expr(lo) + "}"
+        if hi:
+            result += " ^{" + self._convert_expr(hi) + "}"
+        return result
+
+    def _leftright_repl(self, m: re.Match) -> str:
+        """\\left...\\right 쌍을 LEFT/RIGHT 표기로 치환."""
+        left = m.group(1)
+        body = m.group(2)
+        right = m.group(3)
+        l_str = self._DELIM_MAP.get(left, left)
+        r_str = self._DELIM_MAP.get(right, right)
+        inner = self._convert_expr(body)
+        if l_str and r_str:
+            return f"LEFT {l_str} {inner} RIGHT {r_str}"
+        elif l_str:
+            return f"LEFT {l_str} {inner}"
+        elif r_str:
+            return f"{inner} RIGHT {r_str}"
+        return inner
+
+    def _accent_repl(self, m: re.Match) -> str:
+        """accent 명령(\\vec 등)을 HWP 표기로 치환."""
+        cmd = "\\" + m.group(1)
+        body = m.group("body")
+        hwp_accent = self.ACCENT_MAP.get(cmd, m.group(1).upper())
+        return hwp_accent + " {" + self._convert_expr(body) + "}"
+
+    def _sup_repl(self, m: re.Match) -> str:
+        return " ^{" + self._convert_expr(self._get_match(m, "sup")) + "}"
+
+    def _sub_repl(self, m: re.Match) -> str:
+        return " _{" + self._convert_expr(self._get_match(m, "sub")) + "}"
+
+    def _brace_repl(self, m: re.Match) -> str:
+        """단순 { } 그룹 내부를 재귀 변환."""
+        return "{" + self._convert_expr(m.group(1)) + "}"
+
+    # 후처리 치환 테이블 (미등록 명령어는 제거)
+    _CLEANUP_TABLE = {
+        "qquad": "~~~~",
+        "quad": "~~",
+        ",": "`",
+        ";": "~",
+        "!": "",
+        "\\": "",
+    }
+
+    def _cleanup_repl(self, m: re.Match) -> str:
+        """남은 공백 명령은 HWP 표기로, 알 수 없는 명령어는 제거."""
+        return self._CLEANUP_TABLE.get(m.group(1), "")
+
     def _get_match(self, match: re.Match, name: str) -> str:
         """brace_group_or_char에서 값 추출."""
         val = match.group(name)
@@ -332,178 +594,87 @@ class LaTeXToHWPConverter:
         # 전처리: 불필요한 공백, $기호 제거
         s = latex.strip().strip("$").strip()
 
-        # displaymath 환경 제거
-        for env in [r"\[", r"\]", r"\(", r"\)"]:
-            s = s.replace(env, "")
-        for env_name in ["equation", "align", "gather", "displaymath"]:
-            s = re.sub(r"\\begin\{" + env_name + r"\*?\}", "", s)
-            s = re.sub(r"\\end\{" + env_name + r"\*?\}", "", s)
+        # 빠른 경로: 변환 대상 문자가 전혀 없는 리터럴 수식
+        # (선택지 필드의 "x", "12" 류가 상당수 — 파이프라인 전체 생략)
+        if not s:
+            return ""
+        if not any(c in s for c in "\\{}^_"):
+            return s
+
+        # displaymath 환경 제거 (컴파일드 패턴으로 각 1회 스캔)
+        if "\\" in s:
+            s = self._displaymath_re.sub("", s)
+            s = self._env_strip_pattern.sub("", s)
 
         s = s.strip()
+        # 문서가 바뀌어도 캐시가 무한히 자라지 않도록 호출 단위로 초기화
+        self._expr_cache.clear()
         result = self._convert_expr(s)
 
-        # 후처리: 다중 공백 정리
-        result = re.sub(r"  +", " ", result).strip()
-        return result
+        # 후처리: 다중 공백 정리 (이중 공백이 있을 때만 정규식 실행)
+        if "  " in result:
+            result = self._multispace_pattern.sub(" ", result)
+        return result.strip()
 
     def _convert_expr(self, s: str) -> str:
-        """재귀적으로 LaTeX 표현식을 변환."""
+        """재귀적으로 LaTeX 표현식을 변환 (부분식 단위 메모이제이션)."""
         if not s:
             return ""
 
-        # 0. 행렬/조건식 환경: \begin{env}...\end{env}
-        def _env_repl(m: re.Match) -> str:
-            env = m.group(1)
-            content = m.group(2)
-            env_map = {
-                "cases": "CASES",
-                "pmatrix": "PMATRIX",
-                "bmatrix": "BMATRIX",
-                "vmatrix": "DMATRIX",
-                "matrix": "MATRIX",
-            }
-            hwp_env = env_map[env]
-            # \\ → # (행 구분자 변환)
-            content = re.sub(r"\\\\", " # ", content)
-            content = self._convert_expr(content)
-            return hwp_env + " {" + content + "}"
-
-        s = self._env_pattern.sub(_env_repl, s)
-
-        # 1. \text, \mathrm, \mathbf
-        s = self._text_pattern.sub(lambda m: '"' + m.group("txt") + '"', s)
-        s = self._mathrm_pattern.sub(lambda m: "rm " + m.group("txt"), s)
-        s = self._mathbf_pattern.sub(lambda m: "bold " + m.group("txt"), s)
-
-        # 2. \binom{n}{k}
-        s = self._binom_pattern.sub(
-            lambda m: "LEFT ( {"
-            + self._convert_expr(m.group("top"))
-            + "} atop {"
-            + self._convert_expr(m.group("bot"))
-            + "} RIGHT )",
-            s,
-        )
+        cached = self._expr_cache.get(s)
+        if cached is not None:
+            return cached
+        key = s
 
-        # 3. \frac{a}{b}
-        s = self._frac_pattern.sub(
-            lambda m: "{"
-            + self._convert_expr(m.group("num"))
-            + "} over {"
-            + self._convert_expr(m.group("den"))
-            + "}",
-            s,
-        )
+        # 0~10단계는 모두 역슬래시가 있어야만 매치된다.
+        # 재귀 말단은 대부분 "1", "n" 같은 순수 문자열이므로 멤버십 검사
+        # 한 번으로 정규식 스캔 전체를 건너뛴다
+        if "\\" in s:
+            # 0. 행렬/조건식 환경: \begin{env}...\end{env}
+            s = self._env_pattern.sub(self._env_repl, s)
 
-        # 4. \sqrt[n]{x} 또는 \sqrt{x}
-        s = self._sqrt_n_pattern.sub(
-            lambda m: "root {"
-            + self._convert_expr(m.group(1))
-            + "} of {"
-            + self._convert_expr(m.group("body"))
-            + "}",
-            s,
-        )
-        s = self._sqrt_pattern.sub(
-            lambda m: "sqrt {" + self._convert_expr(m.group("body")) + "}", s
-        )
+            # 1. \text, \mathrm, \mathbf
+            s = self._text_pattern.sub(self._text_repl, s)
+            s = self._mathrm_pattern.sub(self._mathrm_repl, s)
+            s = self._mathbf_pattern.sub(self._mathbf_repl, s)
+
+            # 2. \binom{n}{k}
+            if "\\binom" in s:
+                s = self._apply_binom(s)
+
+            # 3. \frac{a}{b}
+            if "frac" in s:
+                s = self._apply_frac(s)
+
+            # 4. \sqrt[n]{x} 또는 \sqrt{x}
+            if "\\sqrt" in s:
+                s = self._apply_sqrt(s)
 
-        # 5. 대형 연산자
-        def _big_op_repl(m: re.Match) -> str:
-            op = m.group(1).upper()
-            op_map = {
-                "SUM": "SUM", "PROD": "PROD", "COPROD": "COPROD",
-                "INT": "INT", "IINT": "DINT", "IIINT": "TINT", "OINT": "OINT",
-                "BIGCUP": "UNION", "BIGCAP": "INTER",
-            }
-            hwp_op = op_map.get(op, op)
-            lo = self._get_match(m, "lo")
-            hi = self._get_match(m, "hi")
-            result = hwp_op
-            if lo:
-                result += " _{" + self._convert_expr(lo) + "}"
-            if hi:
-                result += " ^{" + self._convert_expr(hi) + "}"
-            return result
-
-        s = self._big_op_pattern.sub(_big_op_repl, s)
-
-        # 6. \left( ... \right)
-        def _leftright_repl(m: re.Match) -> str:
-            left = m.group(1)
-            body = m.group(2)
-            right = m.group(3)
-            # 구분 문자 매핑
-            delim_map = {
-                "(": "(", ")": ")", "[": "[", "]": "]",
-                r"\{": "lbrace", r"\}": "rbrace",
-                "{": "lbrace", "}": "rbrace",
-                "|": "|", ".": "",
-            }
-            l_str = delim_map.get(left, left)
-            r_str = delim_map.get(right, right)
-            inner = self._convert_expr(body)
-            if l_str and r_str:
-                return f"LEFT {l_str} {inner} RIGHT {r_str}"
-            elif l_str:
-                return f"LEFT {l_str} {inner}"
-            elif r_str:
-                return f"{inner} RIGHT {r_str}"
-            return inner
-
-        s = self._leftright_pattern.sub(_leftright_repl, s)
-
-        # 7. accent: \vec{A} → VEC A
-        def _accent_repl(m: re.Match) -> str:
-            cmd = "\\" + m.group(1)
-            body = m.group("body")
-            hwp_accent = self.ACCENT_MAP.get(cmd, m.group(1).upper())
-            return hwp_accent + " {" + self._convert_expr(body) + "}"
-
-        s = self._accent_pattern.sub(_accent_repl, s)
-
-        # 8. 그리스 문자
-        for latex_cmd, hwp_name in sorted(
-            self.GREEK_MAP.items(), key=lambda x: -len(x[0])
-        ):
-            s = s.replace(latex_cmd, hwp_name)
-
-        # 9. 기호/연산자
-        for latex_cmd, hwp_sym in sorted(
-            self.SYMBOL_MAP.items(), key=lambda x: -len(x[0])
-        ):
-            s = s.replace(latex_cmd, hwp_sym)
-
-        # 10. 함수명
-        for latex_cmd, hwp_func in sorted(
-            self.FUNC_MAP.items(), key=lambda x: -len(x[0])
-        ):
-            s = s.replace(latex_cmd, hwp_func)
+            # 5. 대형 연산자
+            s = self._big_op_pattern.sub(self._big_op_repl, s)
+
+            # 6. \left( ... \right)
+            s = self._leftright_pattern.sub(self._leftright_repl, s)
+
+            # 7. accent: \vec{A} → VEC A
+            s = self._accent_pattern.sub(self._accent_repl, s)
+
+            # 8~10. 그리스 문자·기호·함수명: 문자열 전체를 한 번만 스캔
+            # (명령어별 str.replace ~150회 대신 단일 컴파일드 알터네이션)
+            s = self._cmd_pattern.sub(self._cmd_repl, s)
 
         # 11. 상첨자/하첨자 (braces 유지)
-        s = self._superscript.sub(
-            lambda m: " ^{" + self._convert_expr(self._get_match(m, "sup")) + "}", s
-        )
-        s = self._subscript.sub(
-            lambda m: " _{" + self._convert_expr(self._get_match(m, "sub")) + "}", s
-        )
+        s = self._superscript.sub(self._sup_repl, s)
+        s = self._subscript.sub(self._sub_repl, s)
 
         # 12. { } 내부 재귀 처리 (단순 그룹)
-        def _brace_recurse(m: re.Match) -> str:
-            inner = m.group(1)
-            return "{" + self._convert_expr(inner) + "}"
-
-        s = re.sub(r"\{([^{}]+)\}", _brace_recurse, s)
+        s = self._simple_brace_pattern.sub(self._brace_repl, s)
 
-        # 13. HWP 공백 문자 및 기타 남은 LaTeX 명령어 정리
-        s = s.replace("\\,", "`")
-        s = s.replace("\\;", "~")
-        s = s.replace("\\!", "")
-        s = s.replace("\\qquad", "~~~~")
-        s = s.replace("\\quad", "~~")
-        s = s.replace("\\\\", "")
-        s = re.sub(r"\\[a-zA-Z]+", "", s)  # 남은 알 수 없는 명령어 제거
+        # 13. HWP 공백 문자 및 기타 남은 LaTeX 명령어 정리 (단일 패스)
+        if "\\" in s:
+            s = self._cleanup_pattern.sub(self._cleanup_repl, s)
 
+        self._expr_cache[key] = s
         return s
 
 
@@ -511,8 +682,9 @@ class LaTeXToHWPConverter:
 _converter = LaTeXToHWPConverter()
 
 
+@lru_cache(maxsize=2048)
 def latex_to_hwpeq(latex: str) -> str:
-    """LaTeX 수식을 HWP 수식 스크립트로 변환.
+    """LaTeX 수식을 HWP 수식 스크립트로 변환 (입력 문자열로 LRU 캐시).
 
     Args:
         latex: LaTeX 수식 문자열 (예: r"\\frac{1}{2}")
@@ -523,6 +695,24 @@ def latex_to_hwpeq(latex: str) -> str:
     return _converter.convert(latex)
 
 
+# latex_to_image용 재사용 Figure (지연 생성). Figure/axes 구성이 호출당
+# 수십 ms를 차지하므로 하나를 만들어 clf()로 재사용한다
+_render_fig = None
+_render_lock = threading.Lock()
+
+
+def _get_render_fig():
+    """렌더링용 Figure 싱글톤 반환 (matplotlib 지연 임포트)."""
+    global _render_fig
+    if _render_fig is None:
+        import matplotlib
+        matplotlib.use("Agg")
+        from matplotlib.figure import Figure
+
+        _render_fig = Figure(figsize=(0.01, 0.01))
+    return _render_fig
+
+
 def latex_to_image(latex: str, dpi: int = 150) -> bytes:
     """LaTeX 수식을 PNG 이미지로 렌더링 (폴백용).
 
@@ -534,34 +724,34 @@ def latex_to_image(latex: str, dpi: int = 150) -> bytes:
         PNG 이미지 바이트
     """
     import io
-    import matplotlib
-    matplotlib.use("Agg")
-    import matplotlib.pyplot as plt
-
-    fig, ax = plt.subplots(figsize=(0.01, 0.01))
-    ax.axis("off")
-
-    # matplotlib의 LaTeX 렌더링
-    text = ax.text(
-        0.5, 0.5,
-        f"${latex}$",
-        transform=ax.transAxes,
-        fontsize=14,
-        ha="center", va="center",
-    )
 
-    # 텍스트 크기에 맞게 그림 크기 조정
-    fig.canvas.draw()
-    renderer = fig.canvas.get_renderer()
-    bbox = text.get_window_extent(renderer=renderer)
-    # 포인트 → 인치 변환 + 여백
-    width = bbox.width / dpi + 0.1
-    height = bbox.height / dpi + 0.1
-    fig.set_size_inches(max(width, 0.5), max(height, 0.3))
-
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png", dpi=dpi, bbox_inches="tight", pad_inches=0.02,
-                transparent=True)
-    plt.close(fig)
-    buf.seek(0)
-    return buf.read()
+    # Figure는 스레드 안전하지 않으므로 렌더링 구간 전체를 잠근다
+    with _render_lock:
+        fig = _get_render_fig()
+        fig.clf()
+        fig.set_size_inches(0.01, 0.01)
+        ax = fig.add_subplot(111)
+        ax.axis("off")
+
+        # matplotlib의 LaTeX 렌더링
+        text = ax.text(
+            0.5, 0.5,
+            f"${latex}$",
+            transform=ax.transAxes,
+            fontsize=14,
+            ha="center", va="center",
+        )
+
+        # 텍스트 크기에 맞게 그림 크기 조정
+        fig.canvas.draw()
+        renderer = fig.canvas.get_renderer()
+        bbox = text.get_window_extent(renderer=renderer)
+        # 포인트 → 인치 변환 + 여백
+        width = bbox.width / dpi + 0.1
+        height = bbox.height / dpi + 0.1
+        fig.set_size_inches(max(width, 0.5), max(height, 0.3))
+
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", dpi=dpi, bbox_inches="tight",
+                    pad_inches=0.02, transparent=True)
+    return buf.getvalue()
@@ -2,18 +2,36 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import logging
 import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from pathlib import Path
 
 from PIL import Image
 import anthropic
 
 logger = logging.getLogger(__name__)
 
-from core.pdf_handler import image_to_base64
-from utils.config import get_api_key, CLAUDE_MODEL, CLAUDE_MAX_TOKENS
+# OCR 결과 디스크 캐시 위치 (이미지 해시 → 파싱된 JSON)
+_OCR_CACHE_DIR = Path.home() / ".cache" / "exam-ocr"
+
+# 재사용 디코더: raw_decode는 JSON 값 끝에서 멈추므로 뒤따르는 설명 텍스트를 허용
+_JSON_DECODER = json.JSONDecoder()
+
+# OCR 응답마다 실행되는 복구 패턴들은 모듈 스코프에서 한 번만 컴파일
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+_LATEX_ESCAPE_RE = re.compile(r'(?<!\\)\\([bfnrt])(?=[a-zA-Z])')
+_CONTROL_CHAR_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+_BAD_BACKSLASH_RE = re.compile(r'\\(?!["\\/bfnrtu])')
+_VALUE_LINE_RE = re.compile(r'^(\s*"value"\s*:\s*")(.*)(")(.*)$')
+
+from core.pdf_handler import image_to_base64, _resize_if_needed
+from utils.config import get_api_key, CLAUDE_MODEL, CLAUDE_MAX_TOKENS, CLAUDE_MAX_EDGE
 
 
 @dataclass
@@ -141,79 +159,230 @@ EXAM_OCR_PROMPT = """당신은 한국 수학 시험지를 정밀하게 OCR하는
 - **이미지의 모든 텍스트를 빠짐없이 추출하세요.**
 """
 
+# 프롬프트 텍스트 블록은 불변 — 호출마다 dict를 새로 만들지 않고 공유.
+# cache_control로 서버 측 프롬프트 캐시를 활성화해 다중 페이지 작업에서
+# 두 번째 호출부터 정적 지시문 처리 비용/지연을 줄인다 (5분 TTL)
+_PROMPT_BLOCK = {
+    "type": "text",
+    "text": EXAM_OCR_PROMPT,
+    "cache_control": {"type": "ephemeral"},
+}
+
+# OCR 결과 캐시 키에 섞는 프롬프트 다이제스트 — 프롬프트 수정 시
+# 기존 디스크 캐시 항목이 자연스럽게 미스가 된다
+_PROMPT_DIGEST = hashlib.blake2b(
+    EXAM_OCR_PROMPT.encode(), digest_size=16
+).digest()
+
 
 class OCREngine:
     """Claude Vision API 기반 OCR 엔진."""
 
-    def __init__(self, api_key: str | None = None):
+    def __init__(self, api_key: str | None = None, use_cache: bool = True):
         self.api_key = api_key or get_api_key()
         self.client = anthropic.Anthropic(api_key=self.api_key)
+        self.async_client = anthropic.AsyncAnthropic(api_key=self.api_key)
+        # 동일 이미지 재인식 방지 캐시 — 재실행·중복 페이지에서
+        # API 과금과 왕복 지연을 통째로 아낀다
+        self.use_cache = use_cache
+        self._ocr_cache: dict[str, dict] = {}
+
+    @staticmethod
+    def _cache_key(image: Image.Image) -> str:
+        """이미지 픽셀 내용 기반 캐시 키 (BLAKE2 — GB/s급 해시).
+
+        프롬프트 다이제스트를 섞어 지시문이 바뀌면 디스크 캐시가
+        자동 무효화되도록 한다 (이전 프롬프트로 만든 결과 오염 방지).
+        """
+        h = hashlib.blake2b(digest_size=16)
+        h.update(_PROMPT_DIGEST)
+        h.update(f"{CLAUDE_MODEL}:{image.mode}:{image.size}".encode())
+        h.update(image.tobytes())
+        return h.hexdigest()
+
+    def _cache_get(self, key: str) -> dict | None:
+        cached = self._ocr_cache.get(key)
+        if cached is not None:
+            return cached
+        # 디스크 캐시: 프로세스 재시작 후에도 유지
+        path = _OCR_CACHE_DIR / f"{key}.json"
+        try:
+            with open(path, encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        self._ocr_cache[key] = cached
+        return cached
+
+    def _cache_put(self, key: str, result: dict) -> None:
+        self._ocr_cache[key] = result
+        try:
+            _OCR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            path = _OCR_CACHE_DIR / f"{key}.json"
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False)
+        except OSError:
+            # 디스크 캐시는 최선 노력 — 실패해도 인식 결과에는 영향 없음
+            logger.debug("OCR 디스크 캐시 기록 실패: %s", key)
+
+    @staticmethod
+    def _build_messages(image: Image.Image, use_png: bool) -> list[dict]:
+        """동기/비동기 경로가 공유하는 요청 페이로드 조립."""
+        if use_png:
+            base64_image = image_to_base64(image, format="PNG")
+            media_type = "image/png"
+        else:
+            image = _resize_if_needed(image, max_size=CLAUDE_MAX_EDGE)
+            base64_image = image_to_base64(image, format="JPEG")
+            media_type = "image/jpeg"
+
+        # 이미지 블록만 호출마다 새로 만들고 프롬프트 블록은 공유 상수 재사용
+        # (재시도에서도 동일 페이로드를 그대로 다시 보낸다).
+        # 캐시는 cache_control 블록까지의 접두사 단위이므로 정적 프롬프트를
+        # 먼저 두어야 페이지가 달라도 캐시를 공유한다 — 이미지가 앞에 오면
+        # 접두사가 페이지마다 달라져 캐시 적중이 불가능하다
+        return [
+            {
+                "role": "user",
+                "content": [
+                    _PROMPT_BLOCK,
+                    {
+                        "type": "image",
+                        "source": {
+                            "type": "base64",
+                            "media_type": media_type,
+                            "data": base64_image,
+                        },
+                    },
+                ],
+            }
+        ]
 
-    def recognize_page(self, image: Image.Image) -> dict:
+    def recognize_page(self, image: Image.Image, use_png: bool = False) -> dict:
         """한 페이지 이미지에서 텍스트+수식 추출.
 
         Args:
             image: 페이지 이미지 (PIL Image)
+            use_png: True면 무손실 PNG로 업로드 (디버깅용; 기본은
+                긴 변 1568px로 축소한 품질 90 JPEG — 업로드 바이트가
+                수 배 줄고 토큰 비용은 해상도 기준이라 동일)
 
         Returns:
             구조화된 OCR 결과 dict
         """
-        base64_image = image_to_base64(image, format="PNG")
+        cache_key = self._cache_key(image) if self.use_cache else None
+        if cache_key is not None:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+
+        messages = self._build_messages(image, use_png)
 
         message = self.client.messages.create(
             model=CLAUDE_MODEL,
             max_tokens=CLAUDE_MAX_TOKENS,
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "image",
-                            "source": {
-                                "type": "base64",
-                                "media_type": "image/png",
-                                "data": base64_image,
-                            },
-                        },
-                        {
-                            "type": "text",
-                            "text": EXAM_OCR_PROMPT,
-                        },
-                    ],
-                }
-            ],
+            messages=messages,
         )
 
         response_text = message.content[0].text
         try:
-            return self._extract_json(response_text)
+            result = self._extract_json(response_text)
         except json.JSONDecodeError as e:
             # JSON 파싱 완전 실패 시 1회 재시도
             logger.warning("JSON 파싱 실패 (1차), 재시도: %s", e)
             message2 = self.client.messages.create(
                 model=CLAUDE_MODEL,
                 max_tokens=CLAUDE_MAX_TOKENS,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "image",
-                                "source": {
-                                    "type": "base64",
-                                    "media_type": "image/png",
-                                    "data": base64_image,
-                                },
-                            },
-                            {
-                                "type": "text",
-                                "text": EXAM_OCR_PROMPT,
-                            },
-                        ],
-                    }
-                ],
+                messages=messages,
+            )
+            result = self._extract_json(message2.content[0].text)
+
+        if cache_key is not None:
+            self._cache_put(cache_key, result)
+        return result
+
+    def recognize_pages(
+        self, images: list[Image.Image], max_workers: int = 8
+    ) -> list[dict]:
+        """여러 페이지를 병렬로 OCR 처리.
+
+        API 호출은 네트워크 대기가 지배적이므로 스레드 풀로 동시 요청한다
+        (anthropic 클라이언트는 httpx 기반으로 스레드 안전).
+        전체 지연이 페이지 수 × 왕복이 아닌 최대 왕복 + 큐잉으로 줄어든다.
+
+        Args:
+            images: 페이지 이미지 목록
+            max_workers: 동시 요청 수 상한 (레이트 리밋 고려)
+
+        Returns:
+            페이지 순서대로 정렬된 OCR 결과 dict 목록
+        """
+        if not images:
+            return []
+        if len(images) == 1:
+            return [self.recognize_page(images[0])]
+
+        workers = min(max_workers, len(images))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.recognize_page, images))
+
+    async def recognize_page_async(
+        self, image: Image.Image, use_png: bool = False
+    ) -> dict:
+        """recognize_page의 비동기 버전 (AsyncAnthropic 사용).
+
+        asyncio 기반 호출자(UI 이벤트 루프 등)가 스레드 풀 없이
+        페이지들을 동시에 대기시킬 수 있다.
+        """
+        cache_key = self._cache_key(image) if self.use_cache else None
+        if cache_key is not None:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+
+        messages = self._build_messages(image, use_png)
+
+        message = await self.async_client.messages.create(
+            model=CLAUDE_MODEL,
+            max_tokens=CLAUDE_MAX_TOKENS,
+            messages=messages,
+        )
+
+        try:
+            result = self._extract_json(message.content[0].text)
+        except json.JSONDecodeError as e:
+            # JSON 파싱 완전 실패 시 1회 재시도
+            logger.warning("JSON 파싱 실패 (1차), 재시도: %s", e)
+            message2 = await self.async_client.messages.create(
+                model=CLAUDE_MODEL,
+                max_tokens=CLAUDE_MAX_TOKENS,
+                messages=messages,
             )
-            return self._extract_json(message2.content[0].text)
+            result = self._extract_json(message2.content[0].text)
+
+        if cache_key is not None:
+            self._cache_put(cache_key, result)
+        return result
+
+    async def recognize_pages_async(
+        self, images: list[Image.Image], concurrency: int = 5
+    ) -> list[dict]:
+        """여러 페이지를 asyncio.gather로 동시 OCR 처리.
+
+        Args:
+            images: 페이지 이미지 목록
+            concurrency: 세마포어로 제한하는 동시 요청 수 (레이트 리밋 고려)
+
+        Returns:
+            페이지 순서대로 정렬된 OCR 결과 dict 목록
+        """
+        sem = asyncio.Semaphore(concurrency)
+
+        async def _bounded(img: Image.Image) -> dict:
+            async with sem:
+                return await self.recognize_page_async(img)
+
+        return list(await asyncio.gather(*(_bounded(img) for img in images)))
 
     def _extract_json(self, text: str) -> dict:
         """응답에서 JSON 추출 (LaTeX 수식이 포함된 경우도 처리).
@@ -241,25 +410,40 @@ class OCREngine:
             if brace_start != -1:
                 text = text[brace_start:]
 
-        # trailing comma 제거
-        text = re.sub(r",\s*([}\]])", r"\1", text)
-
         # ── 1.5단계: LaTeX-JSON 이스케이프 충돌 방지 ──
         # \f(rac), \b(eta), \n(eq), \r(ight), \t(imes) 등은
         # JSON 이스케이프(\f=form-feed, \b=backspace 등)와 충돌하므로
-        # LaTeX 명령어인 경우(\+알파벳 연속) 이중 이스케이프로 보호
-        text = re.sub(r'(?<!\\)\\([bfnrt])(?=[a-zA-Z])', r'\\\\\1', text)
+        # LaTeX 명령어인 경우(\+알파벳 연속) 이중 이스케이프로 보호.
+        # 이 패스는 파싱이 "성공하면서" 값이 깨지는 경우를 막으므로
+        # 첫 파싱 전에 반드시 실행해야 한다
+        if "\\" in text:
+            text = _LATEX_ESCAPE_RE.sub(r'\\\\\1', text)
 
         # ── 2단계: 직접 파싱 ──
+        # raw_decode는 첫 JSON 값 끝에서 멈추므로 닫는 펜스·후행 설명이
+        # 남아 있어도 복구 단계로 빠지지 않고 바로 성공한다
         try:
-            return json.loads(text)
+            obj, _ = _JSON_DECODER.raw_decode(text)
+            return obj
         except json.JSONDecodeError:
             pass
 
+        # ── 2.5단계: trailing comma 제거 후 재시도 ──
+        # (정상 JSON에는 없으므로 실패 경로에서만 스캔)
+        stripped = _TRAILING_COMMA_RE.sub(r"\1", text)
+        if stripped is not text:
+            text = stripped
+            try:
+                obj, _ = _JSON_DECODER.raw_decode(text)
+                return obj
+            except json.JSONDecodeError:
+                pass
+
         # ── 3단계: 문자열 내부 역슬래시 이스케이프 복구 ──
         fixed = self._fix_json_backslashes(text)
         try:
-            return json.loads(fixed)
+            obj, _ = _JSON_DECODER.raw_decode(fixed)
+            return obj
         except json.JSONDecodeError:
             pass
 
@@ -267,7 +451,8 @@ class OCREngine:
         logger.warning("JSON 파싱 실패, 문자열 보호 복구 시도")
         repaired = self._repair_json_strings(text)
         try:
-            return json.loads(repaired)
+            obj, _ = _JSON_DECODER.raw_decode(repaired)
+            return obj
         except json.JSONDecodeError:
             pass
 
@@ -276,7 +461,7 @@ class OCREngine:
         lines = text.split("\n")
         for i, line in enumerate(lines):
             # "value" 필드에서 이스케이프 안 된 큰따옴표 수정
-            match = re.match(r'^(\s*"value"\s*:\s*")(.*)(")(.*)$', line)
+            match = _VALUE_LINE_RE.match(line)
             if match:
                 inner = match.group(2)
                 inner = inner.replace('\\"', '\x00')
@@ -285,7 +470,7 @@ class OCREngine:
                 lines[i] = match.group(1) + inner + match.group(3) + match.group(4)
 
         text = "\n".join(lines)
-        text = re.sub(r",\s*([}\]])", r"\1", text)
+        text = _TRAILING_COMMA_RE.sub(r"\1", text)
         return json.loads(text)
 
     @staticmethod
@@ -295,9 +480,9 @@ class OCREngine:
         전체 텍스트에서 \\X (X가 유효 JSON 이스케이프가 아닌 것)를 \\\\X로 변환.
         JSON 구조 바깥에는 역슬래시가 없으므로 전체 텍스트에 적용해도 안전.
         """
-        text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f]', '', text)
+        text = _CONTROL_CHAR_RE.sub('', text)
         # \u는 유지 (\uXXXX 유니코드 이스케이프일 수 있으므로 — 4단계에서 정밀 처리)
-        return re.sub(r'\\(?!["\\/bfnrtu])', r'\\\\', text)
+        return _BAD_BACKSLASH_RE.sub(r'\\\\', text)
 
     @staticmethod
     def _repair_json_strings(text: str) -> str:
@@ -309,7 +494,7 @@ class OCREngine:
         - 문자열 내 줄바꿈/탭을 이스케이프
         - 내부 따옴표를 감지하여 이스케이프
         """
-        text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f]', '', text)
+        text = _CONTROL_CHAR_RE.sub('', text)
 
         result = []
         i = 0
@@ -415,31 +600,38 @@ def validate_ocr_response(ocr_result: dict) -> OCRQuality:
         quality.warnings.append("인식된 문제가 없습니다. 이미지를 확인하세요.")
 
     # 3) 수식 개수 집계 + LaTeX 괄호 짝 검증
-    for q in questions:
-        _validate_question_latex(q, quality)
-
-    return quality
-
-
-def _validate_question_latex(q_data: dict, quality: OCRQuality) -> None:
-    """문제 내 LaTeX 수식의 괄호 짝을 검증."""
-    for block in q_data.get("contents", []):
-        if block.get("type") in ("equation", "equation_block"):
-            quality.equation_count += 1
-            _check_latex_brackets(block.get("value", ""), quality)
-
-    for choice in q_data.get("choices", []):
-        for block in choice.get("contents", []):
+    # (하위 문항 재귀 대신 명시적 워크리스트 — 프레임 생성 비용 제거)
+    stack = deque(questions)
+    while stack:
+        q_data = stack.popleft()
+        for block in q_data.get("contents", ()):
             if block.get("type") in ("equation", "equation_block"):
                 quality.equation_count += 1
                 _check_latex_brackets(block.get("value", ""), quality)
 
-    for sub in q_data.get("sub_questions", []):
-        _validate_question_latex(sub, quality)
+        for choice in q_data.get("choices", ()):
+            for block in choice.get("contents", ()):
+                if block.get("type") in ("equation", "equation_block"):
+                    quality.equation_count += 1
+                    _check_latex_brackets(block.get("value", ""), quality)
+
+        stack.extend(q_data.get("sub_questions", ()))
+
+    return quality
 
 
 def _check_latex_brackets(latex: str, quality: OCRQuality) -> None:
     """LaTeX 문자열의 중괄호 짝이 맞는지 확인."""
+    # 빠른 경로: 여닫는 개수가 같으면 짝이 맞는 것으로 간주
+    # (str.count는 C 레벨 스캔 — 문자 단위 파이썬 루프는 불일치 시에만)
+    closes = latex.count("}")
+    if latex.count("{") == closes:
+        # 개수가 같아도 닫는 괄호가 먼저 나오는 퇴행 케이스는 find로 검출
+        if closes and latex.find("}") < latex.find("{"):
+            quality.warnings.append(
+                f"LaTeX 괄호 불일치 (닫는 괄호 초과): {latex[:50]}..."
+            )
+        return
     depth = 0
     for ch in latex:
         if ch == "{":
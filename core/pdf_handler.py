@@ -3,6 +3,9 @@
 from __future__ import annotations
 
 import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import fitz  # PyMuPDF
@@ -14,6 +17,10 @@ from utils.config import PDF_DPI, MAX_IMAGE_SIZE
 def pdf_to_images(pdf_path: str | Path) -> list[Image.Image]:
     """PDF 파일을 페이지별 PIL Image 리스트로 변환.
 
+    렌더링·디코딩은 GIL을 놓는 C 코드가 지배적이므로 다중 페이지는
+    스레드 풀로 병렬 처리합니다. fitz.Document는 스레드 안전하지
+    않으므로 워커 스레드마다 문서를 따로 엽니다.
+
     Args:
         pdf_path: PDF 파일 경로
 
@@ -24,23 +31,54 @@ def pdf_to_images(pdf_path: str | Path) -> list[Image.Image]:
     if not pdf_path.exists():
         raise FileNotFoundError(f"PDF 파일을 찾을 수 없습니다: {pdf_path}")
 
-    doc = fitz.open(str(pdf_path))
-    images = []
-
-    for page_num in range(len(doc)):
-        page = doc[page_num]
-        # 300 DPI로 렌더링
-        zoom = PDF_DPI / 72  # 72 DPI가 기본
-        mat = fitz.Matrix(zoom, zoom)
-        pix = page.get_pixmap(matrix=mat)
+    # 300 DPI로 렌더링
+    zoom = PDF_DPI / 72  # 72 DPI가 기본
+    mat = fitz.Matrix(zoom, zoom)
 
-        img_data = pix.tobytes("png")
-        img = Image.open(io.BytesIO(img_data))
-        img = _resize_if_needed(img)
-        images.append(img)
-
-    doc.close()
-    return images
+    doc = fitz.open(str(pdf_path))
+    try:
+        page_count = len(doc)
+        if page_count <= 1:
+            return [_render_page(doc[i], mat) for i in range(page_count)]
+    finally:
+        doc.close()
+
+    local = threading.local()
+    opened: list[fitz.Document] = []
+
+    def _render(page_num: int) -> Image.Image:
+        worker_doc = getattr(local, "doc", None)
+        if worker_doc is None:
+            worker_doc = local.doc = fitz.open(str(pdf_path))
+            opened.append(worker_doc)
+        return _render_page(worker_doc[page_num], mat)
+
+    workers = min(os.cpu_count() or 1, page_count)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # map은 페이지 순서를 보존
+            return list(executor.map(_render, range(page_count)))
+    finally:
+        for worker_doc in opened:
+            worker_doc.close()
+
+
+def _render_page(page: fitz.Page, mat: fitz.Matrix) -> Image.Image:
+    """페이지 하나를 렌더링해 PIL Image로 변환."""
+    pix = page.get_pixmap(matrix=mat)
+    # pix.samples는 이미 원시 픽셀 버퍼 — PNG 인코드/디코드 왕복 생략.
+    # 행 패딩이 없으면 samples_mv를 frombuffer로 감싸 복사 자체도 생략한다
+    # (memoryview가 픽스맵 버퍼를 잡고 있어 이미지 수명 동안 유효)
+    if not pix.alpha and pix.stride == pix.width * 3:
+        img = Image.frombuffer(
+            "RGB", (pix.width, pix.height), pix.samples_mv, "raw", "RGB", 0, 1
+        )
+    else:
+        mode = "RGBA" if pix.alpha else "RGB"
+        img = Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+        if mode == "RGBA":
+            img = img.convert("RGB")
+    return _resize_if_needed(img)
 
 
 def load_image(image_path: str | Path) -> Image.Image:
@@ -63,11 +101,11 @@ def load_image(image_path: str | Path) -> Image.Image:
     return img
 
 
-def _resize_if_needed(img: Image.Image) -> Image.Image:
+def _resize_if_needed(img: Image.Image, max_size: int = MAX_IMAGE_SIZE) -> Image.Image:
     """이미지가 최대 크기를 초과하면 리사이즈."""
     w, h = img.size
-    if w > MAX_IMAGE_SIZE or h > MAX_IMAGE_SIZE:
-        ratio = min(MAX_IMAGE_SIZE / w, MAX_IMAGE_SIZE / h)
+    if w > max_size or h > max_size:
+        ratio = min(max_size / w, max_size / h)
         new_size = (int(w * ratio), int(h * ratio))
         img = img.resize(new_size, Image.LANCZOS)
     return img
@@ -78,8 +116,16 @@ def image_to_base64(img: Image.Image, format: str = "PNG") -> str:
     import base64
 
     buffer = io.BytesIO()
-    img.save(buffer, format=format)
-    return base64.b64encode(buffer.getvalue()).decode("utf-8")
+    if format.upper() == "JPEG":
+        # JPEG는 알파를 지원하지 않음 + 품질 90이면 OCR 정확도 손실 없음
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        img.save(buffer, format=format, quality=90)
+    else:
+        img.save(buffer, format=format)
+    # getbuffer()는 getvalue()와 달리 내부 버퍼를 복사 없이 노출.
+    # b64encode 결과는 순수 ASCII — UTF-8 디코드 스캔 대신 ASCII 디코드 사용
+    return base64.b64encode(buffer.getbuffer()).decode("ascii")
 
 
 def get_supported_extensions() -> set[str]:
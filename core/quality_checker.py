@@ -53,19 +53,25 @@ def check_image_quality(image: Image.Image) -> ImageQuality:
     result.width, result.height = image.size
     _check_resolution(result)
 
-    # 2) 그레이스케일 변환 (블러/대비 측정용)
-    gray = np.array(image.convert("L"), dtype=np.float64)
+    # 2) 빈 페이지 감지 — uint8 합산만으로 판정 가능하므로 가장 먼저.
+    # 빈 페이지면 블러/대비 측정이 무의미하니 float 변환과 Laplacian을 생략
+    result.blank_ratio = _compute_non_white_ratio(arr)
+    _check_blank(result)
+    if result.blank_ratio < QC_BLANK_THRESHOLD:
+        result.passed = False
+        return result
+
+    # 3) 그레이스케일 변환 (블러/대비 측정용).
+    # 0~255 픽셀에는 float32 정밀도로 충분 — float64 대비 메모리
+    # 트래픽과 SIMD 레인 소모가 절반
+    gray = np.asarray(image.convert("L"), dtype=np.float32)
 
-    # 3) 흐림 감지
+    # 4) 흐림 감지
     result.blur_score = _compute_laplacian_variance(gray)
     _check_blur(result)
 
-    # 4) 빈 페이지 감지
-    result.blank_ratio = _compute_non_white_ratio(arr)
-    _check_blank(result)
-
     # 5) 대비 부족 감지
-    result.contrast_std = float(np.std(gray))
+    result.contrast_std = float(np.std(gray, dtype=np.float64))
     _check_contrast(result)
 
     # 최종 합격 판정
@@ -88,18 +94,18 @@ def _check_resolution(result: ImageQuality) -> None:
 
 def _compute_laplacian_variance(gray: np.ndarray) -> float:
     """Laplacian 필터의 분산으로 선명도 측정."""
-    # 간단한 3x3 Laplacian 커널 적용 (scipy/cv2 없이 구현)
-    kernel = np.array([[0, 1, 0],
-                       [1, -4, 1],
-                       [0, 1, 0]], dtype=np.float64)
-    h, w = gray.shape
-    # 패딩된 이미지
+    # 3x3 Laplacian 커널을 시프트 합 한 번으로 적용 (scipy/cv2 없이 구현).
+    # 커널의 0 항을 건너뛰어 이미지 전체 패스가 9회 → 1회로 줄어든다
     padded = np.pad(gray, 1, mode="edge")
-    laplacian = np.zeros_like(gray)
-    for dy in range(3):
-        for dx in range(3):
-            laplacian += kernel[dy, dx] * padded[dy:dy + h, dx:dx + w]
-    return float(np.var(laplacian))
+    laplacian = (
+        -4.0 * padded[1:-1, 1:-1]
+        + padded[:-2, 1:-1]
+        + padded[2:, 1:-1]
+        + padded[1:-1, :-2]
+        + padded[1:-1, 2:]
+    )
+    # 누산만 float64로 수행해 대형 페이지에서의 정밀도 손실 방지
+    return float(np.var(laplacian, dtype=np.float64))
 
 
 def _check_blur(result: ImageQuality) -> None:
@@ -114,11 +120,11 @@ def _check_blur(result: ImageQuality) -> None:
 
 def _compute_non_white_ratio(arr: np.ndarray) -> float:
     """비백색 픽셀 비율(%) 계산."""
-    # 각 픽셀의 밝기 (R+G+B)/3
-    brightness = arr.mean(axis=2)
-    # 240 이상을 '백색'으로 간주
-    non_white = np.sum(brightness < 240)
-    total = brightness.size
+    # 밝기 (R+G+B)/3 < 240 ⟺ R+G+B < 720 — float64 mean 배열(픽셀당 8B)
+    # 대신 uint16 합(픽셀당 2B)으로 판정해 메모리 트래픽을 줄인다
+    channel_sum = arr.sum(axis=2, dtype=np.uint16)
+    non_white = np.count_nonzero(channel_sum < 720)
+    total = channel_sum.size
     return float(non_white / total * 100)
 
 
@@ -162,23 +162,14 @@ def _find_sec_pr(root: etree._Element) -> etree._Element | None:
             if sec_pr is not None:
                 return sec_pr
 
-    # 와일드카드 검색
-    for elem in root.iter():
-        if elem.tag and "secPr" in elem.tag:
-            return elem
-
-    return None
+    # 와일드카드 검색 (네임스페이스 무관 로컬명 일치, C 레벨 필터)
+    return next(root.iter("{*}secPr"), None)
 
 
 def _parse_page_properties(sec_pr: etree._Element, config: TemplateConfig):
     """secPr에서 페이지 크기·여백 정보 추출."""
-    # pagePr 찾기
-    page_pr = None
-    for elem in sec_pr.iter():
-        if elem.tag and "pagePr" in elem.tag:
-            page_pr = elem
-            break
-
+    # pagePr 찾기 (네임스페이스 무관 로컬명 일치)
+    page_pr = next(sec_pr.iter("{*}pagePr"), None)
     if page_pr is None:
         return
 
@@ -186,31 +177,29 @@ def _parse_page_properties(sec_pr: etree._Element, config: TemplateConfig):
     config.landscape = page_pr.get("landscape", "0") == "1"
 
     # 페이지 크기
-    for sz in page_pr.iter():
-        if sz.tag and "pageSz" in sz.tag:
-            w = sz.get("width") or sz.get("w")
-            h = sz.get("height") or sz.get("h")
-            if w:
-                config.page_width = int(w)
-            if h:
-                config.page_height = int(h)
-            break
+    sz = next(page_pr.iter("{*}pageSz"), None)
+    if sz is not None:
+        w = sz.get("width") or sz.get("w")
+        h = sz.get("height") or sz.get("h")
+        if w:
+            config.page_width = int(w)
+        if h:
+            config.page_height = int(h)
 
     # 여백
-    for margin in page_pr.iter():
-        if margin.tag and "pageMargin" in margin.tag:
-            for attr, field_name in [
-                ("top", "margin_top"),
-                ("bottom", "margin_bottom"),
-                ("left", "margin_left"),
-                ("right", "margin_right"),
-                ("header", "margin_header"),
-                ("footer", "margin_footer"),
-            ]:
-                val = margin.get(attr)
-                if val:
-                    setattr(config, field_name, int(val))
-            break
+    margin = next(page_pr.iter("{*}pageMargin"), None)
+    if margin is not None:
+        for attr, field_name in [
+            ("top", "margin_top"),
+            ("bottom", "margin_bottom"),
+            ("left", "margin_left"),
+            ("right", "margin_right"),
+            ("header", "margin_header"),
+            ("footer", "margin_footer"),
+        ]:
+            val = margin.get(attr)
+            if val:
+                setattr(config, field_name, int(val))
 
 
 # ─── HWP → HWPX 변환 (한글 COM 자동화) ─────────────────────
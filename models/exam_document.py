@@ -14,7 +14,7 @@ class ContentType(Enum):
     TABLE = "table"                # 표 (격자/그리드)
 
 
-@dataclass
+@dataclass(slots=True)
 class ContentBlock:
     """문서 내 개별 콘텐츠 블록."""
     type: ContentType
@@ -28,14 +28,14 @@ class ContentBlock:
         return self.type in (ContentType.EQUATION, ContentType.EQUATION_BLOCK)
 
 
-@dataclass
+@dataclass(slots=True)
 class Choice:
     """선택지 (보기)."""
     number: int       # 1~5
     contents: list[ContentBlock] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class Question:
     """시험 문제 하나."""
     number: int
@@ -45,7 +45,7 @@ class Question:
     sub_questions: list[Question] = field(default_factory=list)  # 소문항
 
 
-@dataclass
+@dataclass(slots=True)
 class ExamPage:
     """시험지 한 페이지."""
     page_number: int
@@ -53,7 +53,7 @@ class ExamPage:
     header_text: str = ""   # 페이지 상단 (과목명, 학년 등)
 
 
-@dataclass
+@dataclass(slots=True)
 class ExamDocument:
     """전체 시험 문서."""
     title: str = ""
@@ -37,6 +37,10 @@ PDF_DPI = int(os.getenv("PDF_DPI", "300"))
 # 이미지 최대 크기 (Claude Vision API 제한)
 MAX_IMAGE_SIZE = int(os.getenv("MAX_IMAGE_SIZE", "4096"))
 
+# Vision 업로드 권장 한계: 긴 변이 이 값을 넘으면 서버에서 어차피
+# 축소되므로 전송 전에 맞춰서 업로드 바이트와 TTFT를 줄인다
+CLAUDE_MAX_EDGE = int(os.getenv("CLAUDE_MAX_EDGE", "1568"))
+
 # ─── 이미지 품질 검사 임계값 ───────────────────────────────
 # 최소 해상도 (가로 또는 세로가 이 값 미만이면 경고)
 QC_MIN_WIDTH = int(os.getenv("QC_MIN_WIDTH", "500"))